@@ -3,9 +3,15 @@ import sys
 
 sys.path.append("./src")
 
-from components import render_data_tabs, render_download_section
-from config import APP_TITLE, APP_ICON
+from components import (
+    render_data_tabs,
+    render_download_section,
+    render_stage_timings,
+)
+from config import APP_TITLE, APP_ICON, SHOW_STAGE_TIMINGS
 from processor import process_uploaded_file
+from utils import load_extraction_engine
+from src.telemetry.spans import trace
 
 
 def main():
@@ -16,6 +22,9 @@ def main():
         initial_sidebar_state="collapsed",
     )
 
+    # start loading the layout pipeline before the first upload arrives
+    load_extraction_engine()
+
     st.title(APP_TITLE)
     st.markdown(
         "Upload your resume and get structured information extracted automatically!"
@@ -27,6 +36,8 @@ def main():
         st.session_state.current_file = None
     if "dataframes" not in st.session_state:
         st.session_state.dataframes = None
+    if "stage_timings" not in st.session_state:
+        st.session_state.stage_timings = None
 
     st.markdown("---")
     st.subheader("Upload Resume")
@@ -41,12 +52,14 @@ def main():
         file_changed = st.session_state.current_file != uploaded_file.name
 
         if file_changed or st.session_state.parsed_data is None:
-            parsed_data, dataframes = process_uploaded_file(uploaded_file)
+            with trace("resume", document=uploaded_file.name) as current:
+                parsed_data, dataframes = process_uploaded_file(uploaded_file)
 
             if parsed_data and dataframes:
                 st.session_state.parsed_data = parsed_data
                 st.session_state.current_file = uploaded_file.name
                 st.session_state.dataframes = dataframes
+                st.session_state.stage_timings = (current.breakdown(), current.seconds)
             else:
                 return
         else:
@@ -62,6 +75,9 @@ def main():
                 parsed_data, dataframes, st.session_state.current_file
             )
 
+            if SHOW_STAGE_TIMINGS and st.session_state.stage_timings:
+                render_stage_timings(*st.session_state.stage_timings)
+
     else:
         st.info("""
         ### How to use:
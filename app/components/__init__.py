@@ -8,4 +8,5 @@ from .display import (
 )
 from .download import render_download_section
 from .tab import render_data_tabs
+from .timings import render_stage_timings
 from .job_matching import render_job_matching_tab
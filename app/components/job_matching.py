@@ -1,19 +1,19 @@
 import streamlit as st
-import tempfile
-import os
+import hashlib
 import sys
 
 sys.path.append("./")
 
 from utils.extract_text import extract_text_from_resume
-from utils.jd_parser import parse_job_description_text
+from utils.jd_parser import job_description_cache_model, parse_job_description_text
 from utils.job_matcher import calculate_detailed_similarity, get_match_interpretation
 from src.llm import prompts
+from src.matching.store import content_hash, get_match_store
 
 
 def render_job_matching_tab(parsed_resume):
     st.subheader("Job Description Matching")
-    st.write("Upload a job description to see how well it matches with the resume.")
+    st.write("Upload or paste a job description to see how well it matches with the resume.")
     
     # initialize session state for job matching
     if "jd_parsed_data" not in st.session_state:
@@ -30,50 +30,69 @@ def render_job_matching_tab(parsed_resume):
         help="Upload a PDF, DOCX, or TXT job description file",
         key="jd_uploader"
     )
+    pasted_jd = st.text_area(
+        "Or paste the job description text",
+        height=150,
+        key="jd_pasted_text"
+    )
     
+    # pasted text is identified by its content, uploads by file name
+    jd_key = None
     if uploaded_jd is not None:
-        file_changed = st.session_state.jd_current_file != uploaded_jd.name
+        jd_key = uploaded_jd.name
+    elif pasted_jd.strip():
+        jd_key = "pasted:" + hashlib.sha256(pasted_jd.encode("utf-8")).hexdigest()[:12]
+    
+    if jd_key is not None:
+        file_changed = st.session_state.jd_current_file != jd_key
         
         if file_changed or st.session_state.jd_parsed_data is None:
-            # process the job description
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=f".{uploaded_jd.name.split('.')[-1]}"
-            ) as tmp_file:
-                tmp_file.write(uploaded_jd.getvalue())
-                tmp_file_path = tmp_file.name
+            # a job description opened in any session before skips extraction
+            # and parsing; it's looked up by content, not by file name
+            if uploaded_jd is not None:
+                jd_hash = content_hash(uploaded_jd.getvalue())
+            else:
+                jd_hash = content_hash(pasted_jd.strip())
+            stored_jd = get_match_store().get_job_description(jd_hash, job_description_cache_model())
             
-            try:
-                # extract text from job description
-                jd_text = extract_text_from_resume(tmp_file_path)
-                
-                if jd_text:
+            if stored_jd is not None:
+                jd_text = stored_jd["text"]
+            elif uploaded_jd is not None:
+                # extract text straight from the in-memory upload buffer;
+                # .txt files are decoded without the layout model
+                jd_text = extract_text_from_resume(uploaded_jd, name=uploaded_jd.name)
+            else:
+                jd_text = pasted_jd.strip()
+            
+            if jd_text:
+                if uploaded_jd is not None:
                     with st.expander("View Extracted Job Description Text"):
                         st.text_area("Job Description Text", jd_text, height=200, key="jd_text")
-                    
-                    # parse job description
-                    parsed_jd = parse_job_description_text(jd_text, prompts)
-                    
-                    if parsed_jd:
-                        st.session_state.jd_parsed_data = parsed_jd
-                        st.session_state.jd_current_file = uploaded_jd.name
+                
+                # parse job description
+                if stored_jd is not None:
+                    parsed_jd = stored_jd["parsed"]
+                else:
+                    parsed_jd = parse_job_description_text(jd_text, prompts, jd_hash=jd_hash)
+                
+                if parsed_jd:
+                    st.session_state.jd_parsed_data = parsed_jd
+                    st.session_state.jd_current_file = jd_key
 
-                        # calculate similarity
-                        similarity_results = calculate_detailed_similarity(parsed_resume, parsed_jd)
-                        st.session_state.similarity_results = similarity_results
-                        
-                        st.success("Job description processed successfully!")
-                    else:
-                        st.error("Failed to parse the job description.")
-                        return
+                    # calculate similarity
+                    similarity_results = calculate_detailed_similarity(parsed_resume, parsed_jd)
+                    st.session_state.similarity_results = similarity_results
+                    
+                    st.success("Job description processed successfully!")
                 else:
-                    st.error("Failed to extract text from the job description.")
+                    st.error("Failed to parse the job description.")
                     return
-            finally:
-                # cleanup temp file
-                if os.path.exists(tmp_file_path):
-                    os.unlink(tmp_file_path)
+            else:
+                st.error("Failed to extract text from the job description.")
+                return
         else:
-            st.success(f"Using cached results for: {uploaded_jd.name}")
+            jd_label = uploaded_jd.name if uploaded_jd is not None else "pasted job description"
+            st.success(f"Using cached results for: {jd_label}")
     
     # display results if available
     if st.session_state.jd_parsed_data and st.session_state.similarity_results:
@@ -81,10 +100,10 @@ def render_job_matching_tab(parsed_resume):
             st.session_state.jd_parsed_data, 
             st.session_state.similarity_results
         )
-    elif uploaded_jd is None:
+    elif jd_key is None:
         st.info("""
         ### How to use Job Matching:
-        1. Upload a job description file (PDF, DOCX, or TXT)
+        1. Upload a job description file (PDF, DOCX, or TXT) or paste its text
         2. The system will extract and analyze the job requirements
         3. View the similarity score between your resume and the job description
         4. See detailed matching results for different sections
@@ -10,20 +10,20 @@ from .display import (
 from .job_matching import render_job_matching_tab
 
 
-def render_data_tabs(parsed_data, dataframes):
-    tabs = st.tabs(
-        [
-            "Basic",
-            "Education",
-            "Experience",
-            "Skills",
-            "Certifications",
-            "Projects",
-            "Job Matching",
-            "CSV View",
-            "Raw Data",
-        ]
-    )
+def render_data_tabs(parsed_data, dataframes, job_matching=True):
+    labels = [
+        "Basic",
+        "Education",
+        "Experience",
+        "Skills",
+        "Certifications",
+        "Projects",
+    ]
+    # partial previews are redrawn while the response streams, so they skip
+    # the job matching tab and its keyed widgets
+    if job_matching:
+        labels.append("Job Matching")
+    tabs = st.tabs(labels + ["CSV View", "Raw Data"])
 
     with tabs[0]:  # basic Details
         if parsed_data.get("basic_details"):
@@ -79,10 +79,11 @@ def render_data_tabs(parsed_data, dataframes):
         else:
             st.info("No projects found")
 
-    with tabs[6]:  # job matching
-        render_job_matching_tab(parsed_data)
+    if job_matching:
+        with tabs[6]:  # job matching
+            render_job_matching_tab(parsed_data)
 
-    with tabs[7]:  # csv view
+    with tabs[-2]:  # csv view
         st.subheader("All Data in CSV Format")
         if dataframes:
             for section_name, df in dataframes.items():
@@ -92,5 +93,5 @@ def render_data_tabs(parsed_data, dataframes):
         else:
             st.info("No data available for CSV view")
 
-    with tabs[8]:  # raw data
+    with tabs[-1]:  # raw data
         st.json(parsed_data)
@@ -0,0 +1,26 @@
+import sys
+import streamlit as st
+
+sys.path.append("./")
+from src.telemetry.spans import get_histograms
+
+
+def render_stage_timings(stages, total):
+    summary = get_histograms().summary()
+
+    with st.expander("Stage Timings"):
+        # this resume next to the percentiles over every parse in the process
+        rows = [
+            "| Stage | This resume | Share | p50 | p95 | Samples |",
+            "|---|---:|---:|---:|---:|---:|",
+        ]
+        for name, seconds in [*stages.items(), ("total", total)]:
+            share = f"{seconds / total:.0%}" if total and name != "total" else ""
+            overall = summary.get(name, {})
+            rows.append(
+                f"| {name} | {seconds * 1000:.0f} ms | {share}"
+                f" | {overall.get('p50_seconds', 0) * 1000:.0f} ms"
+                f" | {overall.get('p95_seconds', 0) * 1000:.0f} ms"
+                f" | {overall.get('count', 0)} |"
+            )
+        st.markdown("\n".join(rows))
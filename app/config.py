@@ -1,6 +1,21 @@
+import sys
+
+sys.path.append("./")
+# model and llm mode are shared with the cli, so both hit the same cache
+# entries; LLM_MODE ("combined", "sections" or "hybrid") follows
+# RESUME_PARSER_LLM_MODE, see src/llm/settings.py
+from src.llm.settings import LLM_MODE, LLM_MODEL
+
 # app
 APP_TITLE = "Resume Parser"
 APP_ICON = "📄"
 
 # model
-LLM_MODEL = "gemma-3-27b-it"
+# strip whitespace, bullets and page boilerplate before prompting
+COMPACT_RESUME_TEXT = True
+# show each resume section as soon as the streamed response completes it
+LLM_STREAMING = True
+
+# telemetry
+# per-stage timings of the current resume, below the results
+SHOW_STAGE_TIMINGS = True
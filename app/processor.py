@@ -1,66 +1,91 @@
 import streamlit as st
-import tempfile
-import os
 import sys
 import time
 
 sys.path.append("./")
 
+from components import render_data_tabs
+from config import COMPACT_RESUME_TEXT
 from utils import extract_text_from_resume, parse_resume_text, convert_to_dataframes
 from src.llm import prompts
+from src.llm.compaction import compact_resume_text
+from src.telemetry.spans import current_trace, span
 
 
 def process_uploaded_file(uploaded_file):
-    # save file temporarily
-    with tempfile.NamedTemporaryFile(
-        delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}"
-    ) as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_file_path = tmp_file.name
-
     # create placeholders for temp messages
     text_extraction_placeholder = st.empty()
     parsing_success_placeholder = st.empty()
 
-    try:
-        with st.spinner("Extracting text from resume..."):
-            resume_text = extract_text_from_resume(tmp_file_path)
+    with st.spinner("Extracting text from resume..."):
+        # extract straight from the in-memory upload buffer
+        with span("extraction"):
+            resume_text = extract_text_from_resume(
+                uploaded_file, name=uploaded_file.name
+            )
 
-        if resume_text:
-            # show temp success message for text extraction
-            text_extraction_placeholder.success(
-                f"Text extracted successfully! ({len(resume_text)} characters)"
+    if resume_text:
+        message = f"Text extracted successfully! ({len(resume_text)} characters)"
+        if COMPACT_RESUME_TEXT:
+            # the prompt gets the compacted text, the expander shows it too
+            with span("compaction"):
+                compacted = compact_resume_text(resume_text)
+            resume_text = compacted.text
+            message += (
+                f" Compacted to ~{compacted.tokens} tokens"
+                f" (~{compacted.saved_tokens} saved)."
             )
 
-            with st.expander("View Extracted Text"):
-                st.text_area("Resume Text", resume_text, height=200)
+        # show temp success message for text extraction
+        text_extraction_placeholder.success(message)
+
+        with st.expander("View Extracted Text"):
+            st.text_area("Resume Text", resume_text, height=200)
+
+        # sections render here as they stream in, replaced by the full view
+        preview_placeholder = st.empty()
+        partial_data = {}
 
-            with st.spinner("Parsing resume..."):
-                parsed_data = parse_resume_text(resume_text, prompts)
+        def show_section(section, value):
+            partial_data[section] = value
+            with preview_placeholder.container():
+                render_data_tabs(
+                    partial_data,
+                    convert_to_dataframes(partial_data),
+                    job_matching=False,
+                )
 
-            if parsed_data:
-                # clear the text extraction message
-                text_extraction_placeholder.empty()
+        with st.spinner("Parsing resume..."):
+            parsed_data = parse_resume_text(
+                resume_text, prompts, on_section=show_section
+            )
+
+        if parsed_data:
+            # clear the text extraction message
+            text_extraction_placeholder.empty()
 
-                # show temp success message for parsing
-                parsing_success_placeholder.success("Resume parsed successfully!")
+            # show temp success message for parsing
+            parsing_success_placeholder.success("Resume parsed successfully!")
 
+            with span("dataframes"):
                 dataframes = convert_to_dataframes(parsed_data)
 
-                # clear after 3s
-                time.sleep(3)
-                parsing_success_placeholder.empty()
+            # the message delay below isn't part of the parse
+            trace = current_trace()
+            if trace is not None:
+                trace.stop()
 
-                return parsed_data, dataframes
-            else:
-                text_extraction_placeholder.empty()
-                st.error("Failed to parse the resume.")
-                return None, None
+            # clear after 3s
+            time.sleep(3)
+            parsing_success_placeholder.empty()
+            preview_placeholder.empty()
+
+            return parsed_data, dataframes
         else:
-            st.error("Failed to extract text from the resume.")
+            text_extraction_placeholder.empty()
+            preview_placeholder.empty()
+            st.error("Failed to parse the resume.")
             return None, None
-
-    finally:
-        # cleanup temp file
-        if os.path.exists(tmp_file_path):
-            os.unlink(tmp_file_path)
+    else:
+        st.error("Failed to extract text from the resume.")
+        return None, None
@@ -1,5 +1,28 @@
-from .extract_text import extract_text_from_resume
-from .llm_parser import parse_resume_text
-from .convert_data import convert_to_dataframes
-from .jd_parser import parse_job_description_text
-from .job_matcher import calculate_similarity_score, calculate_detailed_similarity, get_match_interpretation, extract_resume_text_for_matching, extract_jd_text_for_matching
+import importlib
+
+# heavy dependencies (spacy, google-genai, sentence-transformers, pandas) are
+# loaded with the stage that needs them, not when the package is imported
+_EXPORTS = {
+    "extract_text_from_resume": ".extract_text",
+    "load_extraction_engine": ".extract_text",
+    "parse_resume_text": ".llm_parser",
+    "convert_to_dataframes": ".convert_data",
+    "parse_job_description_text": ".jd_parser",
+    "calculate_similarity_score": ".job_matcher",
+    "calculate_detailed_similarity": ".job_matcher",
+    "get_match_interpretation": ".job_matcher",
+    "extract_resume_text_for_matching": ".job_matcher",
+    "extract_jd_text_for_matching": ".job_matcher",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
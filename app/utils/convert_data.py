@@ -1,7 +1,6 @@
-import pandas as pd
-
-
 def convert_to_dataframes(parsed_data):
+    import pandas as pd
+
     dataframes = {}
 
     if parsed_data.get("basic_details"):
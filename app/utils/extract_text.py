@@ -1,14 +1,38 @@
+import sys
+import threading
 import streamlit as st
-import spacy
-from spacy_layout import spaCyLayout
 
+sys.path.append("./")
+from src.extraction.engine import get_engine
 
-def extract_text_from_resume(file_path):
+
+def _warm(engine):
+    try:
+        engine.warm()
+    except Exception:
+        # already logged; kept on engine.warm_error and shown with the next upload
+        pass
+
+
+@st.cache_resource
+def load_extraction_engine():
+    """Create the shared engine once per process and warm it in the background."""
+    engine = get_engine()
+    # most uploads are served by the fast tier, so the first render
+    # shouldn't wait for the layout model to load
+    threading.Thread(target=_warm, args=(engine,), daemon=True).start()
+    return engine
+
+
+def extract_text_from_resume(source, name=None):
     try:
-        nlp = spacy.blank("en")
-        layout = spaCyLayout(nlp)
-        doc = layout(str(file_path))
-        return doc.text
+        engine = load_extraction_engine()
+        if engine.warm_error is not None:
+            st.warning(
+                f"The layout model failed to load ({engine.warm_error}); "
+                "scanned or multi-column files may not extract correctly."
+            )
+        return engine.extract_text(source, name=name)
     except Exception as e:
         st.error(f"Error processing file: {e}")
         return None
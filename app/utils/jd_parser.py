@@ -2,58 +2,80 @@ import json
 import os
 import sys
 import streamlit as st
-from google import genai
 
 sys.path.append("./")
 from config import LLM_MODEL
+from src.concurrency.singleflight import get_single_flight
+from src.llm.cache import get_response_cache
+from src.llm.backends import get_backend
+from src.llm.repair import (
+    JOB_DESCRIPTION_KEYS,
+    describe_repair,
+    is_complete,
+    request_json,
+)
+from src.llm.templates import job_description_prompt_template
+from src.matching.store import get_match_store
 
 
-def parse_job_description_text(jd_text, prompts):
+def job_description_cache_model():
+    return get_backend(api_key=os.getenv("GEMINI_API_KEY")).cache_model(LLM_MODEL)
+
+
+def parse_job_description_text(jd_text, prompts, jd_hash=None):
+    """Parse a job description; with its content hash, share it across sessions."""
     if not jd_text:
         return None
 
-    full_prompt = f"""{prompts.SYSTEM_PROMPT}
-
-Your task is to extract structured information from the job description:
+    template = job_description_prompt_template(prompts)
+    full_prompt = template + jd_text
 
-{prompts.JOB_DESCRIPTION_PROMPT}
+    api_key = os.getenv("GEMINI_API_KEY")
+    backend = get_backend(api_key=api_key)
+    cache_model = backend.cache_model(LLM_MODEL)
 
-Job Description Text:
-{jd_text}"""
+    cache = get_response_cache()
+    cached_response = cache.get(cache_model, template, jd_text)
+    if cached_response is not None:
+        if jd_hash is not None:
+            get_match_store().put_job_description(
+                jd_hash, cache_model, cached_response, jd_text
+            )
+        return cached_response
 
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        if backend.requires_api_key and not api_key:
             st.error("GEMINI_API_KEY environment variable not set!")
             return None
 
-        client = genai.Client(api_key=api_key)
-
-        with st.spinner("Analyzing job description..."):
-            response = client.models.generate_content(
-                model=LLM_MODEL, contents=full_prompt
-            )
+        def request(attempt):
+            with st.spinner("Analyzing job description..."):
+                return backend.generate(LLM_MODEL, full_prompt)
 
         try:
-            # extract JSON from response
-            response_text = response.text.strip()
-            if response_text.startswith("```json"):
-                start_marker = "```json"
-                end_marker = "```"
-                start_idx = response_text.find(start_marker) + len(start_marker)
-                end_idx = response_text.rfind(end_marker)
-                if end_idx > start_idx:
-                    response_text = response_text[start_idx:end_idx].strip()
-
-            parsed_response = json.loads(response_text)
-            return parsed_response
-
+            # malformed json is repaired locally before asking again; the
+            # same job description opened in several sessions is sent once
+            parsed, _ = get_single_flight("llm").do(
+                cache.key(cache_model, template, jd_text),
+                lambda: request_json(request, JOB_DESCRIPTION_KEYS),
+            )
         except json.JSONDecodeError as e:
             st.error(f"Error parsing job description response: {e}")
             with st.expander("Raw Response"):
-                st.text(response.text)
+                st.text(e.doc)
             return None
 
+        repair_summary = describe_repair(parsed)
+        if repair_summary:
+            st.warning(f"Recovered a malformed response ({repair_summary})")
+        if is_complete(parsed):
+            cache.put(cache_model, template, jd_text, parsed["result"])
+            if jd_hash is not None:
+                get_match_store().put_job_description(
+                    jd_hash, cache_model, parsed["result"], jd_text
+                )
+        return parsed["result"]
+
     except Exception as e:
         st.error(f"Error during job description processing: {e}")
         return None
@@ -1,12 +1,56 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import sys
 import streamlit as st
 
+sys.path.append("./")
+from src.matching.store import content_hash, get_match_store
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
 
 @st.cache_resource
 def load_sentence_transformer():
     """Load and cache the sentence transformer model."""
-    return SentenceTransformer('all-MiniLM-L6-v2')
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+def encode_texts(texts):
+    """Embeddings for texts, running the model only on ones not seen before."""
+    import numpy as np
+
+    store = get_match_store()
+    embeddings = store.get_embeddings(EMBEDDING_MODEL, texts)
+    
+    # a popular job description's texts are embedded once for every session
+    missing = [text for text in dict.fromkeys(texts) if text not in embeddings]
+    if missing:
+        encoded = dict(zip(missing, load_sentence_transformer().encode(missing)))
+        store.put_embeddings(EMBEDDING_MODEL, encoded)
+        embeddings.update(encoded)
+    
+    return np.array([embeddings[text] for text in texts])
+
+
+def normalize_rows(embeddings):
+    """Unit-length rows, so a dot product is the cosine similarity."""
+    import numpy as np
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    # zero vectors score 0 against everything, as in sklearn's cosine_similarity
+    norms[norms == 0] = 1
+    return embeddings / norms
+
+
+def score_pairs(pairs):
+    """Cosine similarity of each (resume text, jd text) pair, one model call for all."""
+    texts = [text for pair in pairs.values() for text in pair]
+    normalized = normalize_rows(encode_texts(texts))
+    
+    return {
+        name: float(normalized[2 * index] @ normalized[2 * index + 1])
+        for index, name in enumerate(pairs)
+    }
 
 
 def extract_resume_text_for_matching(parsed_resume):
@@ -105,20 +149,17 @@ def calculate_similarity_score(resume_text, jd_text):
     if not resume_text or not jd_text:
         return 0.0
     
-    model = load_sentence_transformer()
-    
-    # Generate embeddings
-    resume_embedding = model.encode([resume_text])
-    jd_embedding = model.encode([jd_text])
-    
-    # Calculate cosine similarity
-    similarity = cosine_similarity(resume_embedding, jd_embedding)[0][0]
-    
-    return float(similarity)
+    return score_pairs({'overall': (resume_text, jd_text)})['overall']
 
 
 def calculate_detailed_similarity(parsed_resume, parsed_jd):
-    model = load_sentence_transformer()
+    # the same resume against the same job description was scored before
+    store = get_match_store()
+    resume_hash = content_hash(parsed_resume)
+    jd_hash = content_hash(parsed_jd)
+    cached_results = store.get_similarity(resume_hash, jd_hash, EMBEDDING_MODEL)
+    if cached_results is not None:
+        return cached_results
     
     results = {
         'overall_score': 0.0,
@@ -128,6 +169,9 @@ def calculate_detailed_similarity(parsed_resume, parsed_jd):
         'section_scores': {}
     }
     
+    # (resume text, jd text) per score, all embedded in one batched call
+    pairs = {}
+    
     # skills matching
     resume_skills = []
     if parsed_resume.get('skills'):
@@ -152,8 +196,7 @@ def calculate_detailed_similarity(parsed_resume, parsed_jd):
         jd_skills_text = ' '.join([skill for skill in jd_skills if skill and skill != 'null'])
         
         if resume_skills_text and jd_skills_text:
-            skills_embeddings = model.encode([resume_skills_text, jd_skills_text])
-            results['skills_match'] = float(cosine_similarity([skills_embeddings[0]], [skills_embeddings[1]])[0][0])
+            pairs['skills_match'] = (resume_skills_text, jd_skills_text)
     
     # experience matching
     resume_exp = []
@@ -175,8 +218,7 @@ def calculate_detailed_similarity(parsed_resume, parsed_jd):
         jd_exp_text = ' '.join([text for text in jd_exp if text and text != 'null'])
         
         if resume_exp_text and jd_exp_text:
-            exp_embeddings = model.encode([resume_exp_text, jd_exp_text])
-            results['experience_match'] = float(cosine_similarity([exp_embeddings[0]], [exp_embeddings[1]])[0][0])
+            pairs['experience_match'] = (resume_exp_text, jd_exp_text)
     
     # education matching
     resume_edu = []
@@ -196,14 +238,18 @@ def calculate_detailed_similarity(parsed_resume, parsed_jd):
         jd_edu_text = ' '.join([text for text in jd_edu if text and text != 'null'])
         
         if resume_edu_text and jd_edu_text:
-            edu_embeddings = model.encode([resume_edu_text, jd_edu_text])
-            results['education_match'] = float(cosine_similarity([edu_embeddings[0]], [edu_embeddings[1]])[0][0])
+            pairs['education_match'] = (resume_edu_text, jd_edu_text)
     
     # overall score calculation
     resume_full_text = extract_resume_text_for_matching(parsed_resume)
     jd_full_text = extract_jd_text_for_matching(parsed_jd)
-    results['overall_score'] = calculate_similarity_score(resume_full_text, jd_full_text)
+    if resume_full_text and jd_full_text:
+        pairs['overall_score'] = (resume_full_text, jd_full_text)
+    
+    if pairs:
+        results.update(score_pairs(pairs))
     
+    store.put_similarity(resume_hash, jd_hash, EMBEDDING_MODEL, results)
     return results
 
 
@@ -2,85 +2,137 @@ import json
 import os
 import sys
 import streamlit as st
-from google import genai
 
 sys.path.append("./")
-from config import LLM_MODEL
-
-
-def parse_resume_text(resume_text, prompts):
+from config import LLM_MODE, LLM_MODEL, LLM_STREAMING
+from src.concurrency.singleflight import get_single_flight
+from src.llm.cache import get_response_cache
+from src.llm.backends import get_backend
+from src.llm.hybrid import (
+    merge_basic_details,
+    merge_hybrid_response,
+    prepare_hybrid_prompt,
+)
+from src.llm.sections import parse_resume_sections
+from src.llm.repair import RESUME_KEYS, describe_repair, is_complete, request_json
+from src.llm.streaming import SectionStreamParser
+from src.llm.templates import resume_prompt_template
+from src.telemetry.spans import excluded_span, span
+
+
+def parse_resume_text(resume_text, prompts, on_section=None):
     if not resume_text:
         return None
 
-    # combine all prompts into full request
-    full_prompt = f"""{prompts.SYSTEM_PROMPT}
-
-Your task is to extract ALL the following information from the resume in a single JSON response:
-
-1. Basic Details:
-{prompts.BASIC_DETAILS_PROMPT.replace("As a resume parser, your job is to extract basic personal details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
-
-2. Education:
-{prompts.EDUCATION_PROMPT.replace("As a resume parser, your job is to extract education details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
-
-3. Experience:
-{prompts.EXPERIENCE_PROMPT.replace("As a resume parser, your job is to extract work experience details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
-
-4. Skills:
-{prompts.SKILLS_PROMPT.replace("As a resume parser, your job is to extract skills from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
+    if LLM_MODE == "sections":
+        return parse_resume_text_by_section(resume_text, prompts)
 
-5. Certifications:
-{prompts.CERTIFICATIONS_PROMPT.replace("As a resume parser, your job is to extract certifications and licenses from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
-
-6. Projects:
-{prompts.PROJECTS_PROMPT.replace("As a resume parser, your job is to extract project details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
-
-Combine all sections into a single JSON response with the following structure:
-{{
-    "basic_details": {{ ... }},
-    "education": [ ... ],
-    "experience": [ ... ],
-    "skills": {{ ... }},
-    "certifications": [ ... ],
-    "projects": [ ... ]
-}}
-
-Resume text:
-{resume_text}"""
+    # combine all prompts into full request
+    known = None
+    with span("prompt", mode=LLM_MODE):
+        if LLM_MODE == "hybrid":
+            # contact details found locally are left out of the prompt
+            template, known = prepare_hybrid_prompt(resume_text, prompts)
+        else:
+            template = resume_prompt_template(prompts)
+        full_prompt = template + resume_text
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    backend = get_backend(api_key=api_key)
+    cache_model = backend.cache_model(LLM_MODEL)
+
+    # identical resume text under an unchanged prompt was parsed before
+    cache = get_response_cache()
+    with span("cache_lookup") as attributes:
+        cached_response = cache.get(cache_model, template, resume_text)
+        attributes["hit"] = cached_response is not None
+    if cached_response is not None:
+        return merge_known(cached_response, known)
 
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        if backend.requires_api_key and not api_key:
             st.error("GEMINI_API_KEY environment variable not set!")
             return None
 
-        client = genai.Client(api_key=api_key)
+        if on_section is not None and known is not None:
+            on_section = merge_known_section(on_section, known)
 
-        with st.spinner("Analyzing resume..."):
-            response = client.models.generate_content(
-                model=LLM_MODEL, contents=full_prompt
-            )
+        def request(attempt):
+            # only the first attempt streams; a retry replaces the partial view
+            if attempt == 0 and on_section is not None and LLM_STREAMING:
+                return stream_resume_response(backend, full_prompt, on_section)
+            with st.spinner("Analyzing resume..."):
+                return backend.generate(LLM_MODEL, full_prompt)
 
         try:
-            # extract json from response
-            response_text = response.text.strip()
-            if response_text.startswith("```json"):
-                start_marker = "```json"
-                end_marker = "```"
-                start_idx = response_text.find(start_marker) + len(start_marker)
-                end_idx = response_text.rfind(end_marker)
-                if end_idx > start_idx:
-                    response_text = response_text[start_idx:end_idx].strip()
-
-            parsed_response = json.loads(response_text)
-            return parsed_response
-
+            # malformed json is repaired locally; a new request is only made
+            # when nothing could be recovered. sessions parsing the same text
+            # at the same time wait on one request instead of each sending it
+            parsed, _ = get_single_flight("llm").do(
+                cache.key(cache_model, template, resume_text),
+                lambda: request_json(request, RESUME_KEYS),
+            )
         except json.JSONDecodeError as e:
             st.error(f"Error parsing response: {e}")
             with st.expander("Raw Response"):
-                st.text(response.text)
+                st.text(e.doc)
             return None
 
+        repair_summary = describe_repair(parsed)
+        if repair_summary:
+            st.warning(f"Recovered a malformed response ({repair_summary})")
+        # a truncated or partial result is not worth serving again
+        if is_complete(parsed):
+            cache.put(cache_model, template, resume_text, parsed["result"])
+        return merge_known(parsed["result"], known)
+
     except Exception as e:
         st.error(f"Error during processing: {e}")
         return None
+
+
+def merge_known(parsed_response, known):
+    if parsed_response is None or known is None:
+        return parsed_response
+    return merge_hybrid_response(parsed_response, known)
+
+
+def merge_known_section(on_section, known):
+    def show_section(section, value):
+        if section == "basic_details":
+            value = merge_basic_details(value, known)
+        on_section(section, value)
+
+    return show_section
+
+
+def stream_resume_response(backend, full_prompt, on_section):
+    # each top-level section goes to on_section as soon as its json is complete;
+    # rendering it is timed apart from the llm request it interrupts
+    parser = SectionStreamParser()
+    with st.spinner("Analyzing resume..."):
+        for chunk in backend.stream(LLM_MODEL, full_prompt):
+            for section, value in parser.feed(chunk):
+                with excluded_span("render", section=section):
+                    on_section(section, value)
+    return parser.text
+
+
+def parse_resume_text_by_section(resume_text, prompts):
+    api_key = os.getenv("GEMINI_API_KEY")
+    backend = get_backend(api_key=api_key)
+    if backend.requires_api_key and not api_key:
+        st.error("GEMINI_API_KEY environment variable not set!")
+        return None
+
+    # the sections run on their own threads, so they're timed as one stage
+    with st.spinner("Analyzing resume sections..."), span("llm", mode="sections"):
+        parsed_response, errors = parse_resume_sections(
+            resume_text, LLM_MODEL, prompts=prompts, backend=backend
+        )
+
+    # a failed section only drops its own tab
+    for section, error in errors.items():
+        st.warning(f"Could not parse {section.replace('_', ' ')}: {error}")
+
+    return parsed_response or None
@@ -0,0 +1,116 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+# modules that must only load once the stage needing them actually runs
+HEAVY_MODULES = [
+    "spacy",
+    "spacy_layout",
+    "docling",
+    "google.genai",
+    "sentence_transformers",
+    "sklearn",
+    "pandas",
+    "torch",
+]
+
+PROBE = """
+import json, runpy, sys, time
+sys.path[:0] = {paths!r}
+sys.argv = {argv!r}
+start = time.perf_counter()
+try:
+    runpy.run_path({script!r}, run_name={run_name!r})
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print("\\n" + json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+TARGETS = {
+    # python src/main.py --help
+    "cli-help": {
+        "paths": ["."],
+        "argv": ["src/main.py", "--help"],
+        "script": "src/main.py",
+        "run_name": "__main__",
+        "budget": 0.5,
+    },
+    # everything app.py imports before its first render
+    "app-render": {
+        "paths": ["app", "."],
+        "argv": ["app/app.py"],
+        "script": "app/app.py",
+        "run_name": "import_budget",
+        "budget": 2.0,
+    },
+}
+
+
+def measure(target):
+    probe = PROBE.format(heavy=HEAVY_MODULES, **target)
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip())
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["wall"] = wall
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="check cold-start import time of the cli and the app"
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="TARGET=SECONDS",
+        help="override a budget, e.g. cli-help=0.3",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="runs per target, best is kept"
+    )
+    args = parser.parse_args()
+
+    budgets = {name: target["budget"] for name, target in TARGETS.items()}
+    for override in args.budget:
+        name, seconds = override.split("=", 1)
+        budgets[name] = float(seconds)
+
+    failed = False
+    for name, target in TARGETS.items():
+        try:
+            results = [measure(target) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name}: error: {e}")
+            failed = True
+            continue
+
+        best = min(results, key=lambda result: result["elapsed"])
+        over_budget = best["elapsed"] > budgets[name]
+        failed = failed or over_budget or bool(best["heavy"])
+
+        status = "over budget" if over_budget else "ok"
+        print(
+            f"{name}: {best['elapsed']:.3f}s import "
+            f"({best['wall']:.3f}s wall), budget {budgets[name]:.3f}s: {status}"
+        )
+        if best["heavy"]:
+            print(f"  eagerly imported: {', '.join(best['heavy'])}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import copy
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# longest a caller waits on another caller's in-flight computation
+WAIT_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSER_SINGLE_FLIGHT_TIMEOUT", "600"))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        # the leader was interrupted rather than failing, a waiter takes over
+        self.abandoned = False
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and get a copy of its result, or its exception.
+    Nothing is kept once the call finishes, caching is left to the caller.
+    """
+
+    def __init__(self, wait_timeout: Optional[float] = WAIT_TIMEOUT_SECONDS):
+        self.wait_timeout = wait_timeout
+        self.counts = {"calls": 0, "coalesced": 0, "takeovers": 0}
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn once per in-flight key; returns (result, shared).
+
+        Raises TimeoutError when the computation being waited on takes longer
+        than wait_timeout.
+        """
+        with self._lock:
+            self.counts["calls"] += 1
+
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+                    self.counts["coalesced"] += 1
+
+            if leader:
+                return self._lead(key, call, fn), False
+
+            if not call.done.wait(self.wait_timeout):
+                raise TimeoutError(
+                    f"gave up waiting on an identical call after {self.wait_timeout}s"
+                )
+            if call.abandoned:
+                with self._lock:
+                    self.counts["takeovers"] += 1
+                continue
+            if call.error is not None:
+                raise call.error
+            # waiters may belong to other sessions that mutate what they get
+            return copy.deepcopy(call.result), True
+
+    def _lead(self, key: str, call: _Call, fn: Callable[[], Any]) -> Any:
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # streamlit's RerunException/StopException or a KeyboardInterrupt
+            # only concern the leader's own session, never the waiters
+            call.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.counts, "in_flight": len(self._calls)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Process-wide group for one kind of work, e.g. "llm"."""
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.get(name)
+            if group is None:
+                group = _groups[name] = SingleFlight()
+    return group
@@ -0,0 +1,86 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.extraction.tiers import LAYOUT
+
+SUPPORTED_SUFFIXES = (".pdf", ".docx")
+
+# per-process state, populated by the pool initializer in each worker
+_worker_tier: Optional[str] = None
+
+
+def find_resume_files(directory) -> List[Path]:
+    return sorted(
+        path
+        for path in Path(directory).rglob("*")
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def _init_worker(tier: Optional[str]) -> None:
+    global _worker_tier
+    _worker_tier = tier
+
+    # load the heavy extraction state once per worker, not once per file;
+    # pdfminer and docx2txt are imported by the engine module itself
+    from src.extraction.engine import get_engine
+
+    engine = get_engine()
+    # the batch already uses every core, so don't split documents further
+    engine.parallel_min_pages = 0
+
+    # only a layout-only batch is sure to need the layout model; in auto mode
+    # it loads on the first document that needs it, as in the app
+    if (tier or engine.default_tier) == LAYOUT:
+        try:
+            engine.warm()
+        except Exception as e:
+            # an initializer that raises breaks the whole pool; the error is
+            # kept on engine.warm_error and each file reports its own failure
+            print(f"error loading the layout model: {e}")
+
+
+def extract_file(file_path: str, tier: Optional[str] = None) -> Dict[str, Any]:
+    from src.extraction.engine import get_engine
+
+    # timed here, the parent process records it as the extraction stage
+    start = time.perf_counter()
+    try:
+        result = get_engine().extract(file_path, tier=tier or _worker_tier)
+        return {
+            "path": file_path,
+            "text": result["text"],
+            "tier": result["tier"],
+            "error": None,
+            "seconds": time.perf_counter() - start,
+        }
+    except Exception as e:
+        print(f"error extracting file {file_path}: {e}")
+        return {
+            "path": file_path,
+            "text": None,
+            "tier": None,
+            "error": str(e),
+            "seconds": time.perf_counter() - start,
+        }
+
+
+def extract_batch(
+    file_paths: Iterable, max_workers: Optional[int] = None, tier: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Extract many files on a process pool, yielding results as they finish."""
+    file_paths = [str(path) for path in file_paths]
+    if not file_paths:
+        return
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(tier,)
+    ) as pool:
+        futures = [pool.submit(extract_file, path) for path in file_paths]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from src.extraction.source import read_source
+
+# bump to invalidate every cached extraction after an extractor change
+EXTRACTOR_VERSION = "1"
+
+DEFAULT_CACHE_DIR = os.getenv("RESUME_PARSER_CACHE_DIR", ".cache")
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_PARSER_TEXT_CACHE_MB", "256")) * 1024 * 1024
+
+
+class TextCache:
+    """Content-addressed on-disk cache of extracted text with LRU eviction."""
+
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR) / "text"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # running size of the cache directory, scanned once and then kept
+        # up to date by put(); eviction rescans, which also picks up entries
+        # written by other processes
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def key(self, data, extractor: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{extractor}:{EXTRACTOR_VERSION}".encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def get(self, key: str, counted: bool = True) -> Optional[str]:
+        """Cached text for a key; bookkeeping lookups pass counted=False."""
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            if counted:
+                with self._lock:
+                    self.misses += 1
+            return None
+
+        # mtime doubles as the lru timestamp
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        if counted:
+            with self._lock:
+                self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced_bytes = path.stat().st_size
+        except OSError:
+            replaced_bytes = 0
+
+        # write to a sibling temp file first so readers never see partial text
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        written_bytes = path.stat().st_size
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += written_bytes - replaced_bytes
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        for path in self.cache_dir.glob("*/*.txt"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+
+            # oldest access first
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        continue
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self._total_bytes = total
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+            }
+
+
+_cache: Optional[TextCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> TextCache:
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TextCache()
+    return _cache
+
+
+def cached_extract(
+    source, extractor: str, extract_fn: Callable[[memoryview], str], cache=None
+) -> str:
+    cache = cache or get_text_cache()
+    data, _ = read_source(source)
+
+    key = cache.key(data, extractor)
+    text = cache.get(key)
+    if text is None:
+        text = extract_fn(data)
+        if text:
+            cache.put(key, text)
+    return text
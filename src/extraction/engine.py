@@ -0,0 +1,247 @@
+import io
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from src.concurrency.singleflight import SingleFlight
+from src.extraction.cache import get_text_cache
+from src.extraction.parallel import (
+    PARALLEL_MIN_PAGES,
+    analyze_pdf_parallel,
+    should_split,
+)
+from src.extraction.source import detect_format, read_source
+from src.extraction.text import TEXT_FORMATS, decode_text
+from src.extraction.tiers import (
+    AUTO,
+    FAST,
+    LAYOUT,
+    TEXT,
+    TIERS,
+    analyze_docx,
+    analyze_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIER = os.getenv("RESUME_PARSER_EXTRACTION_TIER", AUTO)
+
+# cache namespaces of the fast-tier extractors, shared with the step2/3 parsers
+FAST_EXTRACTORS = {"pdf": "pdfminer", "docx": "docx2txt"}
+
+
+def _build_warmup_pdf() -> bytes:
+    # smallest single-page pdf that exercises the full layout pipeline
+    stream = b"BT /F1 12 Tf 10 20 Td (warmup) Tj ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 50] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        pdf += b"%010d 00000 n \n" % offset
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    return pdf
+
+
+class ExtractionEngine:
+    def __init__(
+        self,
+        cache=None,
+        default_tier: str = DEFAULT_TIER,
+        parallel_min_pages: int = PARALLEL_MIN_PAGES,
+    ):
+        self.cache = cache or get_text_cache()
+        self.default_tier = default_tier
+        self.parallel_min_pages = parallel_min_pages
+        self.tier_counts: Dict[str, int] = {TEXT: 0, FAST: 0, LAYOUT: 0}
+        self._layout = None
+        self._build_lock = threading.Lock()
+        # docling converters are not documented as thread-safe, so calls into
+        # the shared pipeline are serialized
+        self._call_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        # identical documents submitted at the same time are extracted once
+        self._flights = SingleFlight()
+        self.warmed = False
+        # set when warming fails, warm() usually runs on a background thread
+        self.warm_error: Optional[Exception] = None
+
+    @property
+    def layout(self):
+        if self._layout is None:
+            with self._build_lock:
+                if self._layout is None:
+                    # heavy: only imported once a document needs the layout model
+                    import spacy
+                    from spacy_layout import spaCyLayout
+
+                    nlp = spacy.blank("en")
+                    self._layout = spaCyLayout(nlp)
+        return self._layout
+
+    def warm(self) -> None:
+        if self.warmed:
+            return
+
+        # the first conversion loads the layout models, so run one up front
+        # instead of on the first real upload
+        try:
+            self._extract_layout(memoryview(_build_warmup_pdf()), "pdf")
+        except Exception as e:
+            self.warm_error = e
+            logger.exception("warming the layout pipeline failed")
+            raise
+        self.warm_error = None
+        self.warmed = True
+
+    def _extract_layout(self, data: memoryview, file_format: Optional[str]) -> str:
+        from docling.datamodel.base_models import DocumentStream
+
+        # docling picks the backend from the stream name, so give it a real
+        # suffix; DocumentStream only accepts a BytesIO, so this tier copies
+        stream = DocumentStream(
+            name=f"resume.{file_format or 'pdf'}", stream=io.BytesIO(data)
+        )
+
+        layout = self.layout
+        with self._call_lock:
+            result = layout.converter.convert(stream)
+            doc = layout(result.document)
+        return doc.text
+
+    def _extract_fast(self, data: memoryview, file_format: str):
+        if file_format == "pdf":
+            # long pdfs are laid out in page ranges on worker processes
+            if should_split(data, self.parallel_min_pages):
+                return analyze_pdf_parallel(data)
+            return analyze_pdf(data)
+        return analyze_docx(data)
+
+    def _cached(self, data: memoryview, extractor: str, extract_fn) -> str:
+        key = self.cache.key(data, extractor)
+        text = self.cache.get(key)
+        if text is None:
+            text = extract_fn()
+            if text:
+                self.cache.put(key, text)
+        return text
+
+    def _assess(self, data: memoryview, file_format: str):
+        """Return the fast-tier text, or None and the reason to escalate."""
+        text_key = self.cache.key(data, FAST_EXTRACTORS[file_format])
+        decision_key = self.cache.key(data, "tier-decision")
+
+        # an empty decision means the fast tier was good enough last time;
+        # decisions stay out of the hit/miss counts, which are about text
+        decision = self.cache.get(decision_key, counted=False)
+        if decision:
+            return None, decision
+        if decision is not None:
+            text = self.cache.get(text_key)
+            if text is not None:
+                return text, None
+
+        text, reason = self._extract_fast(data, file_format)
+        if text:
+            self.cache.put(text_key, text)
+        self.cache.put(decision_key, reason or "")
+        return text, reason
+
+    def _record(self, text: str, tier: str, reason: Optional[str]) -> Dict[str, Any]:
+        with self._stats_lock:
+            self.tier_counts[tier] += 1
+        return {"text": text, "tier": tier, "reason": reason}
+
+    def extract(
+        self, source, name: Optional[str] = None, tier: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Extract text, trying pdfminer/docx2txt before the layout model.
+
+        Plain-text inputs are decoded straight from the buffer.
+
+        Returns a dict with the text, the tier that served it and, when the
+        layout model was used, the reason it was needed.
+        """
+        tier = tier or self.default_tier
+        if tier not in TIERS:
+            raise ValueError(f"unknown extraction tier: {tier}")
+
+        data, name = read_source(source, name)
+        file_format = detect_format(data, name)
+
+        if file_format in TEXT_FORMATS:
+            return self._record(decode_text(data), TEXT, None)
+
+        result, _ = self._flights.do(
+            self.cache.key(data, f"extract:{file_format}:{tier}"),
+            lambda: self._extract(data, file_format, tier),
+        )
+        return result
+
+    def _extract(
+        self, data: memoryview, file_format: Optional[str], tier: str
+    ) -> Dict[str, Any]:
+        if file_format not in FAST_EXTRACTORS:
+            # only the layout model understands anything else
+            reason = "unsupported_format"
+        elif tier == FAST:
+            text = self._cached(
+                data,
+                FAST_EXTRACTORS[file_format],
+                lambda: self._extract_fast(data, file_format)[0],
+            )
+            return self._record(text, FAST, None)
+        elif tier == AUTO:
+            text, reason = self._assess(data, file_format)
+            if reason is None:
+                return self._record(text, FAST, None)
+        else:
+            reason = "requested"
+
+        text = self._cached(
+            data, "spacy-layout", lambda: self._extract_layout(data, file_format)
+        )
+        return self._record(text, LAYOUT, reason)
+
+    def extract_text(
+        self, source, name: Optional[str] = None, tier: Optional[str] = None
+    ) -> str:
+        """Extract text from a path, bytes, memoryview or file-like object."""
+        return self.extract(source, name=name, tier=tier)["text"]
+
+
+_engine: Optional[ExtractionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ExtractionEngine:
+    global _engine
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ExtractionEngine()
+    return _engine
+
+
+def warm_engine() -> ExtractionEngine:
+    engine = get_engine()
+    engine.warm()
+    return engine
@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+from src.extraction.source import BufferReader
+from src.extraction.tiers import analyze_pdf_pages, decide_pdf_tier
+
+# documents shorter than this are laid out serially; 0 disables the split
+PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARSER_PARALLEL_MIN_PAGES", "8"))
+PAGES_PER_CHUNK = int(os.getenv("RESUME_PARSER_PAGES_PER_CHUNK", "4"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_page_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the streamlit server is multi-threaded
+                _pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def count_pdf_pages(data) -> int:
+    parser = PDFParser(BufferReader(data))
+    document = PDFDocument(parser)
+
+    pages = resolve1(document.catalog.get("Pages"))
+    count = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+    if isinstance(count, int):
+        return count
+
+    # malformed page tree, walk it instead
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def page_ranges(page_count: int, pages_per_chunk: int) -> List[range]:
+    return [
+        range(start, min(start + pages_per_chunk, page_count))
+        for start in range(0, page_count, pages_per_chunk)
+    ]
+
+
+def _analyze_range(data: bytes, pages: range) -> Tuple[str, bool, int]:
+    return analyze_pdf_pages(data, page_numbers=set(pages))
+
+
+def analyze_pdf_parallel(
+    data, pages_per_chunk: int = PAGES_PER_CHUNK
+) -> Tuple[str, Optional[str]]:
+    """Lay out page ranges on worker processes and stitch them back in order.
+
+    Every page is laid out independently by pdfminer, so the result is
+    identical to the serial analyze_pdf.
+    """
+    ranges = page_ranges(count_pdf_pages(data), pages_per_chunk)
+
+    # memoryviews don't pickle; the pool pickles these bytes straight into
+    # each worker's pipe, with no copy on disk
+    data = bytes(data)
+    pool = get_page_pool()
+    futures = [pool.submit(_analyze_range, data, pages) for pages in ranges]
+    chunks = [future.result() for future in futures]
+
+    text = "".join(chunk_text for chunk_text, _, _ in chunks)
+    multi_column = any(chunk_multi_column for _, chunk_multi_column, _ in chunks)
+    page_count = sum(chunk_pages for _, _, chunk_pages in chunks)
+    return text, decide_pdf_tier(text, multi_column, page_count)
+
+
+def should_split(data, min_pages: int = PARALLEL_MIN_PAGES) -> bool:
+    if not min_pages or (os.cpu_count() or 1) < 2:
+        return False
+    try:
+        return count_pdf_pages(data) >= min_pages
+    except Exception:
+        # let the serial path surface the real parsing error
+        return False
@@ -0,0 +1,42 @@
+from typing import Container, Iterator, Optional
+
+from pdfminer.high_level import extract_pages, extract_text
+from pdfminer.layout import LTContainer, LTPage, LTText, LTTextBox
+import docx2txt
+
+from src.extraction.source import BufferReader
+
+
+def extract_pdf_text(data) -> str:
+    return extract_text(BufferReader(data))
+
+
+def extract_docx_text(data) -> str:
+    return docx2txt.process(BufferReader(data))
+
+
+def iter_pdf_pages(
+    data, page_numbers: Optional[Container[int]] = None, maxpages: int = 0
+) -> Iterator[LTPage]:
+    # pdfminer lays out one page at a time, so this stays lazy
+    yield from extract_pages(
+        BufferReader(data), page_numbers=page_numbers, maxpages=maxpages
+    )
+
+
+def render_page_text(page: LTPage) -> str:
+    """Render a laid-out page exactly like pdfminer's TextConverter does."""
+    parts = []
+
+    def render(item):
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            parts.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            parts.append("\n")
+
+    render(page)
+    parts.append("\f")
+    return "".join(parts)
@@ -0,0 +1,81 @@
+import io
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+Source = Union[str, Path, bytes, bytearray, memoryview, io.IOBase]
+
+
+def read_source(source, name: Optional[str] = None) -> Tuple[memoryview, Optional[str]]:
+    """Return the raw bytes of a path, buffer or file-like object without temp files."""
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as file:
+            data = file.read()
+        return memoryview(data), name or str(source)
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source), name
+
+    if hasattr(source, "getbuffer"):
+        # in-memory uploads (BytesIO, streamlit's UploadedFile): no copy
+        return source.getbuffer(), name or getattr(source, "name", None)
+
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return memoryview(source.read()), name or getattr(source, "name", None)
+
+    raise TypeError(f"unsupported source type: {type(source).__name__}")
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable read-only file over a buffer, for readers that want a file.
+
+    Unlike io.BytesIO(data) it reads straight from the buffer, so an upload
+    is never copied whole just to be parsed.
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position : self._position + len(buffer)]
+        buffer[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("negative seek position")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def detect_format(data: memoryview, name: Optional[str] = None) -> Optional[str]:
+    if name and "." in name:
+        return name.rsplit(".", 1)[-1].lower()
+
+    # fall back to magic bytes for anonymous buffers
+    head = bytes(data[:5])
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    return None
@@ -0,0 +1,49 @@
+from typing import Iterator, Optional
+
+from src.extraction.plain import extract_docx_text, iter_pdf_pages, render_page_text
+from src.extraction.source import detect_format, read_source
+
+
+def iter_page_texts(
+    source,
+    name: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield document text page by page, stopping at a page or character budget.
+
+    Pdfs are laid out lazily, so pages past the budget are never processed.
+    Docx files have no page structure and come back as a single chunk.
+    """
+    data, name = read_source(source, name)
+    file_format = detect_format(data, name)
+
+    if file_format == "pdf":
+        pages = (
+            render_page_text(page)
+            for page in iter_pdf_pages(data, maxpages=max_pages or 0)
+        )
+    elif file_format == "docx":
+        pages = iter([extract_docx_text(data)])
+    else:
+        raise ValueError("unsupported file format. only PDF and DOCX supported.")
+
+    remaining = max_chars
+    for page_text in pages:
+        if remaining is not None:
+            if len(page_text) >= remaining:
+                yield page_text[:remaining]
+                return
+            remaining -= len(page_text)
+        yield page_text
+
+
+def extract_text_prefix(
+    source,
+    name: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> str:
+    return "".join(
+        iter_page_texts(source, name=name, max_pages=max_pages, max_chars=max_chars)
+    )
@@ -0,0 +1,57 @@
+import codecs
+from typing import Optional
+
+TEXT_FORMATS = ("txt", "text", "md")
+
+# share of accented letters above which cp1252 is probably the wrong guess
+MAX_ACCENTED_RATIO = 0.3
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def detect_encoding(data) -> str:
+    head = bytes(data[:4])
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+
+    try:
+        codecs.decode(data, "utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    # ats exports that aren't utf-8 are almost always windows-1252; a high
+    # share of accented letters means some other single-byte code page
+    try:
+        text = codecs.decode(data, "cp1252")
+        letters = [char for char in text if char.isalpha()]
+        accented = sum(1 for char in letters if char >= "\u00c0")
+        if not letters or accented / len(letters) < MAX_ACCENTED_RATIO:
+            return "cp1252"
+    except UnicodeDecodeError:
+        pass
+
+    # charset-normalizer ships with requests, but is not a hard dependency
+    try:
+        from charset_normalizer import from_bytes
+
+        best = from_bytes(bytes(data)).best()
+        if best is not None:
+            return best.encoding
+    except ImportError:
+        pass
+
+    return "latin-1"
+
+
+def decode_text(data, encoding: Optional[str] = None) -> str:
+    """Decode a plain-text upload, detecting its encoding when not given."""
+    text = codecs.decode(data, encoding or detect_encoding(data), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
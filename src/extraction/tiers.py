@@ -0,0 +1,115 @@
+import re
+from typing import Container, List, Optional, Tuple
+
+from pdfminer.layout import LTPage, LTTextBox
+
+from src.extraction.plain import extract_docx_text, iter_pdf_pages, render_page_text
+
+AUTO = "auto"
+FAST = "fast"
+LAYOUT = "layout"
+TIERS = (AUTO, FAST, LAYOUT)
+# plain-text inputs are decoded directly and never reach a document model
+TEXT = "text"
+
+# below this many characters per page the pdf is probably scanned or image-based
+MIN_CHARS_PER_PAGE = 200
+# share of one- to three-character lines that suggests broken reading order
+MAX_SHORT_LINE_RATIO = 0.35
+# number of right-hand text boxes that must sit beside left-hand ones
+MIN_SIDE_BY_SIDE_BOXES = 3
+
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+
+def _is_multi_column(page: LTPage) -> bool:
+    width = page.width or 1
+    middle = width / 2
+    margin = width * 0.05
+
+    boxes = [item for item in page if isinstance(item, LTTextBox)]
+    left = [box for box in boxes if box.x1 <= middle + margin]
+    right = [box for box in boxes if box.x0 >= middle - margin]
+    # boxes spanning the middle, e.g. bullets under a title with a
+    # right-aligned date; columns need a gutter nothing crosses
+    crossing = [box for box in boxes if box not in left and box not in right]
+    if not left or not right:
+        return False
+
+    def overlaps(box, y0, y1):
+        return box.y0 < y1 and y0 < box.y1
+
+    # right-hand boxes that share a vertical band with a left-hand box
+    side_by_side = sorted(
+        (
+            box
+            for box in right
+            if any(overlaps(box, other.y0, other.y1) for other in left)
+        ),
+        key=lambda box: -box.y1,
+    )
+
+    # count them in runs not interrupted by a box crossing the gutter
+    run = 0
+    previous = None
+    for box in side_by_side:
+        if any(overlaps(other, box.y0, box.y1) for other in crossing):
+            run, previous = 0, None
+            continue
+        if previous is not None and any(
+            overlaps(other, box.y0, previous.y1) for other in crossing
+        ):
+            run = 0
+        run += 1
+        previous = box
+        if run >= MIN_SIDE_BY_SIDE_BOXES:
+            return True
+    return False
+
+
+def assess_text(text: str, page_count: int = 1) -> Optional[str]:
+    """Return why the layout model is needed for this text, or None."""
+    stripped = text.strip()
+    if len(stripped) < MIN_CHARS_PER_PAGE * max(page_count, 1):
+        return "sparse_text"
+
+    if len(CID_PATTERN.findall(text)) > 10:
+        return "unmapped_glyphs"
+
+    lines = [line.strip() for line in stripped.splitlines() if line.strip()]
+    short_lines = sum(1 for line in lines if len(line) <= 3)
+    if lines and short_lines / len(lines) > MAX_SHORT_LINE_RATIO:
+        return "scrambled_order"
+
+    return None
+
+
+def analyze_pdf_pages(
+    data, page_numbers: Optional[Container[int]] = None
+) -> Tuple[str, bool, int]:
+    """Lay out pdf pages with pdfminer, returning text, column flag and page count."""
+    page_texts: List[str] = []
+    multi_column = False
+
+    for page in iter_pdf_pages(data, page_numbers=page_numbers):
+        page_texts.append(render_page_text(page))
+        multi_column = multi_column or _is_multi_column(page)
+
+    return "".join(page_texts), multi_column, len(page_texts)
+
+
+def decide_pdf_tier(text: str, multi_column: bool, page_count: int) -> Optional[str]:
+    if multi_column:
+        return "multi_column"
+    return assess_text(text, page_count)
+
+
+def analyze_pdf(data) -> Tuple[str, Optional[str]]:
+    """Extract pdf text with pdfminer and decide whether to escalate."""
+    text, multi_column, page_count = analyze_pdf_pages(data)
+    return text, decide_pdf_tier(text, multi_column, page_count)
+
+
+def analyze_docx(data) -> Tuple[str, Optional[str]]:
+    text = extract_docx_text(data)
+    return text, assess_text(text)
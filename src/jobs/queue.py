@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_QUEUE_PATH = (
+    Path(os.getenv("RESUME_PARSER_CACHE_DIR", ".cache")) / "jobs.sqlite3"
+)
+# a claimed job whose worker hasn't checkpointed for this long is requeued
+LEASE_SECONDS = float(os.getenv("RESUME_PARSER_JOB_LEASE_SECONDS", "900"))
+MAX_ATTEMPTS = int(os.getenv("RESUME_PARSER_JOB_MAX_ATTEMPTS", "3"))
+
+QUEUED = "queued"
+EXTRACTING = "extracting"
+PARSING = "parsing"
+DONE = "done"
+FAILED = "failed"
+STATES = (QUEUED, EXTRACTING, PARSING, DONE, FAILED)
+IN_PROGRESS = (EXTRACTING, PARSING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    content_sha256 TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    text TEXT,
+    tier TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Durable SQLite queue of resume files moving through the pipeline.
+
+    Jobs go queued -> extracting -> parsing -> done (or failed). The extracted
+    text and the parsed result are checkpointed on the job row, so a job
+    picked up again after a crash skips every stage it already finished.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        output_dir="output",
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.path = Path(path or DEFAULT_QUEUE_PATH)
+        self.output_dir = Path(output_dir)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # one short-lived connection per call, as in the llm response cache
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _output_path(self, connection, path: Path) -> str:
+        # files from different folders can share a stem
+        output_path = self.output_dir / f"output_{path.stem}.json"
+        taken = connection.execute(
+            "SELECT 1 FROM jobs WHERE output_path = ?", (str(output_path),)
+        ).fetchone()
+        if taken:
+            digest = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:8]
+            output_path = self.output_dir / f"output_{path.stem}_{digest}.json"
+        return str(output_path)
+
+    def enqueue(self, paths: Iterable) -> int:
+        """Add files to the queue, returning how many were new or changed.
+
+        A file already queued is left alone unless its content changed, in
+        which case its checkpoints are dropped and it starts over. A failed
+        job gets a fresh set of attempts, resuming from its checkpoints.
+        """
+        added = 0
+        now = time.time()
+        with closing(self._connect()) as connection:
+            for path in paths:
+                path = Path(path).resolve()
+                content_sha256 = file_sha256(path)
+
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    "SELECT id, content_sha256, state FROM jobs WHERE path = ?",
+                    (str(path),),
+                ).fetchone()
+                if row is None:
+                    connection.execute(
+                        """
+                        INSERT INTO jobs (path, content_sha256, output_path, state,
+                                          created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            str(path),
+                            content_sha256,
+                            self._output_path(connection, path),
+                            QUEUED,
+                            now,
+                            now,
+                        ),
+                    )
+                    added += 1
+                elif row["content_sha256"] != content_sha256:
+                    connection.execute(
+                        """
+                        UPDATE jobs SET content_sha256 = ?, state = ?, attempts = 0,
+                            worker = NULL, text = NULL, tier = NULL, result = NULL,
+                            error = NULL, updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (content_sha256, QUEUED, now, row["id"]),
+                    )
+                    added += 1
+                elif row["state"] == FAILED:
+                    connection.execute(
+                        "UPDATE jobs SET state = ?, attempts = 0, updated_at = ? "
+                        "WHERE id = ?",
+                        (QUEUED, now, row["id"]),
+                    )
+                    added += 1
+                connection.execute("COMMIT")
+        return added
+
+    def recover(self) -> int:
+        """Requeue in-progress jobs whose worker died or whose lease ran out.
+
+        A job that has already used up its attempts is failed instead, so a
+        file that crashes its worker every time isn't retried forever.
+        """
+        host = socket.gethostname()
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                f"SELECT id, worker, attempts, updated_at FROM jobs WHERE state IN "
+                f"({', '.join('?' for _ in IN_PROGRESS)})",
+                IN_PROGRESS,
+            ).fetchall()
+
+            stale = []
+            for row in rows:
+                worker_host, _, pid = (row["worker"] or "").rpartition(":")
+                if worker_host == host and pid.isdigit():
+                    dead = not _pid_alive(int(pid))
+                else:
+                    dead = False
+                if dead:
+                    error = "worker died"
+                elif now - row["updated_at"] > self.lease_seconds:
+                    error = "lease expired"
+                else:
+                    continue
+                if row["attempts"] >= self.max_attempts:
+                    stale.append((FAILED, error, now, row["id"]))
+                else:
+                    stale.append((QUEUED, None, now, row["id"]))
+
+            # checkpoints stay, so a requeued job resumes at the stage it reached
+            connection.executemany(
+                "UPDATE jobs SET state = ?, worker = NULL, error = COALESCE(?, error),"
+                " updated_at = ? WHERE id = ?",
+                stale,
+            )
+            connection.execute("COMMIT")
+        return len(stale)
+
+    def claim(self, worker: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job, or None when there is none."""
+        worker = worker or worker_id()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+
+            # a job whose text was checkpointed goes straight to parsing
+            state = PARSING if row["text"] is not None else EXTRACTING
+            connection.execute(
+                """
+                UPDATE jobs SET state = ?, worker = ?, attempts = attempts + 1,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (state, worker, time.time(), row["id"]),
+            )
+            connection.execute("COMMIT")
+
+        job = dict(row)
+        job["state"] = state
+        job["attempts"] += 1
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def _update(self, job_id: int, **fields) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with closing(self._connect()) as connection:
+            connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def checkpoint_text(self, job_id: int, text: str, tier: Optional[str]) -> None:
+        self._update(job_id, state=PARSING, text=text, tier=tier)
+
+    def checkpoint_result(self, job_id: int, result: Dict[str, Any]) -> None:
+        self._update(job_id, result=json.dumps(result, ensure_ascii=False))
+
+    def complete(self, job_id: int) -> None:
+        self._update(job_id, state=DONE, worker=None, error=None)
+
+    def fail(self, job_id: int, error: str, attempts: int) -> str:
+        """Requeue a failed job, or fail it for good after max_attempts."""
+        state = FAILED if attempts >= self.max_attempts else QUEUED
+        self._update(job_id, state=state, worker=None, error=error)
+        return state
+
+    def counts(self) -> Dict[str, int]:
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update({state: count for state, count in rows})
+        return counts
+
+    def failed_jobs(self):
+        with closing(self._connect()) as connection:
+            return [
+                dict(row)
+                for row in connection.execute(
+                    "SELECT path, error FROM jobs WHERE state = ? ORDER BY id",
+                    (FAILED,),
+                )
+            ]
@@ -0,0 +1,169 @@
+import json
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.extraction.tiers import LAYOUT
+from src.jobs.queue import FAILED, JobQueue
+
+
+def write_output(output_path, parsed_response: Dict[str, Any]) -> None:
+    # write beside the target and rename, so a crash never leaves half a file
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(parsed_response, file, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def parse_text(resume_text: str, backend, cache) -> Dict[str, Any]:
+    from src.llm.repair import RESUME_KEYS, is_complete, request_json
+    from src.llm.settings import LLM_MODEL
+    from src.llm.templates import resume_prompt_template
+
+    template = resume_prompt_template()
+    cache_model = backend.cache_model(LLM_MODEL)
+    cached_response = cache.get(cache_model, template, resume_text)
+    if cached_response is not None:
+        return cached_response
+
+    parsed = request_json(
+        lambda attempt: backend.generate(LLM_MODEL, template + resume_text),
+        RESUME_KEYS,
+    )
+    if is_complete(parsed):
+        cache.put(cache_model, template, resume_text, parsed["result"])
+    return parsed["result"]
+
+
+def process_job(queue: JobQueue, job, engine, backend, cache, tier, compact) -> str:
+    from src.llm.compaction import compact_resume_text
+    from src.telemetry.spans import span
+
+    try:
+        text = job["text"]
+        if text is None:
+            with span("extraction") as attributes:
+                extracted = engine.extract(job["path"], tier=tier)
+                attributes["tier"] = extracted["tier"]
+            text = extracted["text"]
+            if not text:
+                raise ValueError("no text extracted")
+            queue.checkpoint_text(job["id"], text, extracted["tier"])
+
+        parsed_response = job["result"]
+        if parsed_response is None:
+            prompt_text = text
+            if compact:
+                with span("compaction"):
+                    prompt_text = compact_resume_text(text).text
+            parsed_response = parse_text(prompt_text, backend, cache)
+            queue.checkpoint_result(job["id"], parsed_response)
+
+        write_output(job["output_path"], parsed_response)
+        queue.complete(job["id"])
+        print(f"done: {job['path']} -> {job['output_path']}")
+        return "done"
+
+    except Exception as e:
+        state = queue.fail(job["id"], str(e), job["attempts"])
+        verb = "failed" if state == FAILED else "will retry"
+        print(f"error processing {job['path']} ({verb}): {e}")
+        return state
+
+
+def work(
+    queue_path,
+    output_dir: str,
+    tier: Optional[str],
+    compact: bool,
+    backend_name: Optional[str],
+    telemetry_path: Optional[str] = None,
+) -> None:
+    """Worker process loop: claim, process and checkpoint until the queue is empty."""
+    from src.extraction.engine import get_engine
+    from src.llm.backends import get_backend
+    from src.llm.cache import get_response_cache
+    from src.telemetry.spans import set_telemetry_path
+
+    # spawned workers start from a fresh interpreter, so the parent's
+    # --telemetry setting has to be handed over
+    set_telemetry_path(telemetry_path)
+
+    queue = JobQueue(queue_path, output_dir)
+    engine = get_engine()
+    # one file per process already uses every core
+    engine.parallel_min_pages = 0
+    backend = get_backend(backend_name)
+    cache = get_response_cache()
+
+    # only layout-tier jobs are sure to need the layout model; in auto mode
+    # it loads on the first document that needs it
+    warm = (tier or engine.default_tier) == LAYOUT
+    while True:
+        job = queue.claim()
+        if job is None:
+            return
+        if job["text"] is None and warm:
+            warm = False
+            try:
+                engine.warm()
+            except Exception as e:
+                # the job then fails through process_job like any other
+                # extraction error, instead of taking the worker down with it
+                print(f"error loading the layout model: {e}")
+        process_job(queue, job, engine, backend, cache, tier, compact)
+
+
+def run_queue(
+    paths,
+    workers: Optional[int] = None,
+    tier: Optional[str] = None,
+    compact: bool = True,
+    backend_name: Optional[str] = None,
+    queue_path=None,
+    output_dir: str = "output",
+    telemetry_path: Optional[str] = None,
+) -> Dict[str, int]:
+    """Enqueue files and work the queue down with a pool of worker processes.
+
+    Safe to re-run after a crash: finished jobs are skipped and interrupted
+    ones resume from their last checkpoint.
+    """
+    queue = JobQueue(queue_path, output_dir)
+    added = queue.enqueue(paths)
+    recovered = queue.recover()
+    counts = queue.counts()
+    print(
+        f"queue: {added} new, {recovered} recovered, {counts['queued']} to process,"
+        f" {counts['done']} already done"
+    )
+
+    workers = min(workers or os.cpu_count() or 1, max(counts["queued"], 1))
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=work,
+            args=(queue.path, output_dir, tier, compact, backend_name, telemetry_path),
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        if process.exitcode:
+            print(f"worker {process.pid} exited with code {process.exitcode}")
+
+    # a job left behind by a worker that died is requeued for the next run,
+    # or failed once it has used up its attempts
+    queue.recover()
+    return queue.counts()
@@ -0,0 +1,212 @@
+import asyncio
+import copy
+import json
+import os
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Union
+
+from src.llm.backends import get_backend
+from src.llm.cache import get_response_cache
+from src.llm.compiler import estimate_tokens
+from src.llm.repair import (
+    JOB_DESCRIPTION_KEYS,
+    REPAIR_RETRIES,
+    RESUME_KEYS,
+    is_complete,
+    parse_json_response,
+)
+from src.llm.settings import LLM_MODEL
+from src.llm.templates import job_description_prompt_template, resume_prompt_template
+from src.telemetry.spans import span
+
+TEMPLATES = {
+    "resume": resume_prompt_template,
+    "job_description": job_description_prompt_template,
+}
+
+EXPECTED_KEYS = {"resume": RESUME_KEYS, "job_description": JOB_DESCRIPTION_KEYS}
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        # a request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class AsyncParseEngine:
+    """Keeps up to `concurrency` resume/job description parses in flight."""
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        api_key: Optional[str] = None,
+        concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        cache=None,
+        backend=None,
+    ):
+        self.model = model
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.concurrency = concurrency
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self.cache = cache or get_response_cache()
+        self.backend = backend or get_backend(api_key=self.api_key)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def _throttle(self, prompt: str) -> None:
+        if self.request_bucket:
+            await self.request_bucket.acquire()
+        if self.token_bucket:
+            await self.token_bucket.acquire(estimate_tokens(prompt))
+
+    async def parse(self, text: str, kind: str = "resume") -> Dict[str, Any]:
+        template = TEMPLATES[kind]()
+
+        cache_model = self.backend.cache_model(self.model)
+        cached = await asyncio.to_thread(self.cache.get, cache_model, template, text)
+        if cached is not None:
+            return cached
+
+        # duplicate texts in one batch share the request of the first
+        key = self.cache.key(cache_model, template, text)
+        request = self._in_flight.get(key)
+        if request is not None:
+            return copy.deepcopy(await asyncio.shield(request))
+
+        request = asyncio.ensure_future(self._request(template, text, kind))
+        self._in_flight[key] = request
+        request.add_done_callback(lambda _: self._finished(key, request))
+        return await asyncio.shield(request)
+
+    def _finished(self, key: str, request: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        # retrieved here so a request whose callers were all cancelled
+        # doesn't log an unretrieved exception
+        if not request.cancelled():
+            request.exception()
+
+    async def _request(self, template: str, text: str, kind: str) -> Dict[str, Any]:
+        prompt = template + text
+        for attempt in range(REPAIR_RETRIES + 1):
+            await self._throttle(prompt)
+            with span("llm", attempt=attempt):
+                response_text = await self.backend.agenerate(self.model, prompt)
+
+            # repaired locally when possible, requested again only if not
+            try:
+                with span("json_decode", attempt=attempt):
+                    parsed = parse_json_response(response_text, EXPECTED_KEYS[kind])
+                break
+            except json.JSONDecodeError:
+                if attempt == REPAIR_RETRIES:
+                    raise
+
+        if is_complete(parsed):
+            await asyncio.to_thread(
+                self.cache.put,
+                self.backend.cache_model(self.model),
+                template,
+                text,
+                parsed["result"],
+            )
+        return parsed["result"]
+
+    async def parse_many(
+        self,
+        texts: Union[Iterable[str], AsyncIterable[str]],
+        kind: str = "resume",
+        ordered: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parse texts concurrently.
+
+        texts may be an async iterable, each text is parsed as soon as it
+        arrives rather than once all of them are known.
+
+        Yields {"index", "result", "error"} dicts, in input order when `ordered`
+        is set and as each parse completes otherwise.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # finished tasks, then None once every text has been submitted
+        finished: asyncio.Queue = asyncio.Queue()
+        tasks = []
+
+        async def run(index: int, text: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self.parse(text, kind=kind)
+                    return {"index": index, "result": result, "error": None}
+                except Exception as e:
+                    return {"index": index, "result": None, "error": str(e)}
+
+        def submit(text: str) -> None:
+            task = asyncio.create_task(run(len(tasks), text))
+            task.add_done_callback(finished.put_nowait)
+            tasks.append(task)
+
+        async def feed() -> None:
+            try:
+                if hasattr(texts, "__aiter__"):
+                    async for text in texts:
+                        submit(text)
+                else:
+                    for text in texts:
+                        submit(text)
+            finally:
+                finished.put_nowait(None)
+
+        feeder = asyncio.create_task(feed())
+        buffered: Dict[int, Dict[str, Any]] = {}
+        submitted = None
+        yielded = 0
+        try:
+            while submitted is None or yielded < submitted:
+                task = await finished.get()
+                if task is None:
+                    submitted = len(tasks)
+                    continue
+
+                outcome = task.result()
+                if not ordered:
+                    yielded += 1
+                    yield outcome
+                    continue
+                buffered[outcome["index"]] = outcome
+                while yielded in buffered:
+                    yielded += 1
+                    yield buffered.pop(yielded - 1)
+            # surfaces an error raised while producing the texts
+            await feeder
+        finally:
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,224 @@
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterator, Optional
+
+from src.llm.settings import REQUEST_TIMEOUT_SECONDS
+
+# "gemini" calls the live api, "standin" the local replay server in
+# src/llm/standin.py
+DEFAULT_BACKEND = os.getenv("RESUME_PARSER_LLM_BACKEND", "gemini")
+STANDIN_URL = os.getenv("RESUME_PARSER_STANDIN_URL", "http://127.0.0.1:8765")
+# append every live response here, in the stand-in's recordings format
+RECORD_PATH = os.getenv("RESUME_PARSER_LLM_RECORD")
+
+
+class BackendError(Exception):
+    """A failed backend request, with the http status when there was one."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class LLMBackend(abc.ABC):
+    """Prompt text in, response text out."""
+
+    name = "base"
+    requires_api_key = False
+
+    def cache_model(self, model: str) -> str:
+        # responses from different backends never share cache entries
+        return f"{self.name}:{model}"
+
+    @abc.abstractmethod
+    def generate(self, model: str, prompt: str) -> str:
+        """The full response text for a prompt."""
+
+    def stream(self, model: str, prompt: str) -> Iterator[str]:
+        # backends without streaming answer in a single chunk
+        yield self.generate(model, prompt)
+
+    async def agenerate(self, model: str, prompt: str) -> str:
+        return await asyncio.to_thread(self.generate, model, prompt)
+
+    def stats(self) -> Dict[str, object]:
+        return {}
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+    requires_api_key = True
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+
+    def cache_model(self, model: str) -> str:
+        # the live api keeps the plain model name, as before backends existed
+        return model
+
+    def generate(self, model: str, prompt: str) -> str:
+        from src.llm.client import generate_content
+
+        return generate_content(model, prompt, api_key=self.api_key).text
+
+    def stream(self, model: str, prompt: str) -> Iterator[str]:
+        from src.llm.client import generate_content_stream
+
+        yield from generate_content_stream(model, prompt, api_key=self.api_key)
+
+    async def agenerate(self, model: str, prompt: str) -> str:
+        from src.llm.client import get_client
+
+        response = await get_client(self.api_key).aio.models.generate_content(
+            model=model, contents=prompt
+        )
+        return response.text
+
+
+class StandInBackend(LLMBackend):
+    """Client for the local stand-in server that replays recorded responses."""
+
+    name = "standin"
+
+    def __init__(self, base_url: str = STANDIN_URL):
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self._client = httpx.Client(
+            base_url=self.base_url, timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        # async clients are bound to the event loop that created them
+        self._async_clients: Dict[int, object] = {}
+
+    def _raise_for_status(self, response) -> None:
+        if response.status_code >= 400:
+            raise BackendError(
+                f"stand-in returned {response.status_code}: {response.text}",
+                status=response.status_code,
+            )
+
+    def generate(self, model: str, prompt: str) -> str:
+        response = self._client.post(
+            "/generate", json={"model": model, "prompt": prompt}
+        )
+        self._raise_for_status(response)
+        return response.json()["text"]
+
+    def stream(self, model: str, prompt: str) -> Iterator[str]:
+        with self._client.stream(
+            "POST", "/stream", json={"model": model, "prompt": prompt}
+        ) as response:
+            if response.status_code >= 400:
+                response.read()
+            self._raise_for_status(response)
+            yield from response.iter_text()
+
+    async def agenerate(self, model: str, prompt: str) -> str:
+        import httpx
+
+        loop_id = id(asyncio.get_running_loop())
+        client = self._async_clients.get(loop_id)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=REQUEST_TIMEOUT_SECONDS
+            )
+            self._async_clients[loop_id] = client
+
+        response = await client.post(
+            "/generate", json={"model": model, "prompt": prompt}
+        )
+        self._raise_for_status(response)
+        return response.json()["text"]
+
+
+def prompt_template(prompt: str) -> str:
+    """The static part of a prompt: everything up to the input text label."""
+    index = max(prompt.rfind("Resume text:\n"), prompt.rfind("Job Description Text:\n"))
+    if index < 0:
+        return prompt
+    return prompt[: prompt.index("\n", index) + 1]
+
+
+def recording_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RecordingBackend(LLMBackend):
+    """Wraps a backend and appends each response to a recordings file."""
+
+    def __init__(self, backend: LLMBackend, path: str):
+        self.backend = backend
+        self.path = path
+        self.name = backend.name
+        self.requires_api_key = backend.requires_api_key
+        self._lock = threading.Lock()
+
+    def cache_model(self, model: str) -> str:
+        return self.backend.cache_model(model)
+
+    def stats(self) -> Dict[str, object]:
+        return self.backend.stats()
+
+    def _record(self, prompt: str, text: str) -> None:
+        record = {
+            "prompt_sha256": recording_key(prompt),
+            "template_sha256": recording_key(prompt_template(prompt)),
+            "text": text,
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def generate(self, model: str, prompt: str) -> str:
+        text = self.backend.generate(model, prompt)
+        self._record(prompt, text)
+        return text
+
+    def stream(self, model: str, prompt: str) -> Iterator[str]:
+        chunks = []
+        for chunk in self.backend.stream(model, prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._record(prompt, "".join(chunks))
+
+    async def agenerate(self, model: str, prompt: str) -> str:
+        text = await self.backend.agenerate(model, prompt)
+        await asyncio.to_thread(self._record, prompt, text)
+        return text
+
+
+BACKENDS = {"gemini": GeminiBackend, "standin": StandInBackend}
+
+_backends: Dict[tuple, LLMBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def _build_backend(name: str, api_key: Optional[str]) -> LLMBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"unknown llm backend: {name}")
+
+    from src.llm.policy import PolicyBackend
+
+    backend = GeminiBackend(api_key) if name == "gemini" else BACKENDS[name]()
+    if RECORD_PATH:
+        backend = RecordingBackend(backend, RECORD_PATH)
+    # timeouts, retries and hedging apply to every call site
+    return PolicyBackend(backend)
+
+
+def get_backend(name: Optional[str] = None, api_key: Optional[str] = None):
+    """Process-wide backend instance for this name and api key."""
+    name = name or DEFAULT_BACKEND
+    key = (name, api_key if name == "gemini" else None)
+
+    backend = _backends.get(key)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(key)
+            if backend is None:
+                backend = _build_backend(name, api_key)
+                _backends[key] = backend
+    return backend
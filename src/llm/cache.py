@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.llm import prompts
+
+DEFAULT_CACHE_DIR = os.getenv("RESUME_PARSER_CACHE_DIR", ".cache")
+DEFAULT_TTL_SECONDS = int(os.getenv("RESUME_PARSER_LLM_CACHE_TTL_DAYS", "30")) * 86400
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESUME_PARSER_LLM_CACHE_MAX_ENTRIES", "50000"))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _prompts_version() -> str:
+    # any edit to prompts.py invalidates every cached response
+    with open(prompts.__file__, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+PROMPTS_VERSION = _prompts_version()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompts_version TEXT NOT NULL,
+    template_hash TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """SQLite cache of parsed LLM responses.
+
+    Entries are keyed by model, prompts.py version, prompt template and input
+    text, expire after a TTL and are evicted least-recently-used past a size cap.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path or Path(DEFAULT_CACHE_DIR) / "llm_responses.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            # drop everything written against an older prompts.py
+            connection.execute(
+                "DELETE FROM responses WHERE prompts_version != ?", (PROMPTS_VERSION,)
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # one short-lived connection per call keeps this safe across threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def key(self, model: str, template: str, input_text: str) -> str:
+        return _sha256(
+            "\0".join(
+                [model, PROMPTS_VERSION, _sha256(template), _sha256(input_text)]
+            )
+        )
+
+    def get(
+        self, model: str, template: str, input_text: str
+    ) -> Optional[Dict[str, Any]]:
+        key = self.key(model, template, input_text)
+        now = time.time()
+
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and now - row[1] > self.ttl_seconds:
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+
+            if row is not None:
+                connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(
+        self, model: str, template: str, input_text: str, response: Dict[str, Any]
+    ) -> None:
+        now = time.time()
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.key(model, template, input_text),
+                    model,
+                    PROMPTS_VERSION,
+                    _sha256(template),
+                    _sha256(input_text),
+                    json.dumps(response, ensure_ascii=False),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        connection.execute(
+            """
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with closing(self._connect()) as connection:
+            (entries,) = connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,130 @@
+import os
+import threading
+from typing import Dict, Iterator, Optional
+
+from src.llm.settings import LLM_MODEL, REQUEST_TIMEOUT_SECONDS
+
+# pool sizing for the shared httpx clients underneath genai
+MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "32"))
+KEEPALIVE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "120"))
+
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _build_client(api_key: str):
+    from google import genai
+    from google.genai import types
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_SECONDS,
+    )
+    try:
+        http_options = types.HttpOptions(
+            # milliseconds; httpx applies it to each read, so a stalled
+            # stream fails instead of hanging
+            timeout=int(REQUEST_TIMEOUT_SECONDS * 1000),
+            client_args={"limits": limits},
+            async_client_args={"limits": limits},
+        )
+    except (TypeError, ValueError):
+        # older google-genai releases don't expose client args; their
+        # defaults still pool and keep connections alive
+        http_options = None
+
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+def get_client(api_key: Optional[str] = None):
+    """Return the process-wide genai client for this api key.
+
+    genai clients are thread-safe, so one instance (and its connection pool)
+    is shared by every streamlit session and worker thread.
+    """
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _build_client(api_key)
+                _clients[api_key] = client
+    return client
+
+
+def reset_client(api_key: Optional[str] = None) -> None:
+    """Make the next get_client build a fresh client.
+
+    The old client isn't closed, other threads may still be mid-request on
+    it; it is collected once the last of them lets go.
+    """
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    with _clients_lock:
+        _clients.pop(api_key, None)
+
+
+def health_check(api_key: Optional[str] = None, model: str = LLM_MODEL) -> bool:
+    """Cheap round-trip through the shared client; resets it when broken."""
+    try:
+        get_client(api_key).models.get(model=model)
+        return True
+    except Exception:
+        reset_client(api_key)
+        return False
+
+
+def is_connection_error(error: Exception) -> bool:
+    import httpx
+
+    return isinstance(error, (httpx.TransportError, ConnectionError))
+
+
+def generate_content(model: str, contents: str, api_key: Optional[str] = None):
+    """generate_content on the shared client, rebuilding it once after a
+    broken connection."""
+    try:
+        return get_client(api_key).models.generate_content(
+            model=model, contents=contents
+        )
+    except Exception as e:
+        if not is_connection_error(e):
+            raise
+        reset_client(api_key)
+        return get_client(api_key).models.generate_content(
+            model=model, contents=contents
+        )
+
+
+def generate_content_stream(
+    model: str, contents: str, api_key: Optional[str] = None
+) -> Iterator[str]:
+    """Yield the response text chunk by chunk as it is generated.
+
+    A broken connection before the first chunk rebuilds the shared client and
+    retries once; after that the partial response can't be replayed.
+    """
+
+    def open_stream():
+        stream = iter(
+            get_client(api_key).models.generate_content_stream(
+                model=model, contents=contents
+            )
+        )
+        return stream, next(stream, None)
+
+    try:
+        stream, first = open_stream()
+    except Exception as e:
+        if not is_connection_error(e):
+            raise
+        reset_client(api_key)
+        stream, first = open_stream()
+
+    if first is None:
+        return
+    yield first.text or ""
+    for chunk in stream:
+        yield chunk.text or ""
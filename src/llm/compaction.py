@@ -0,0 +1,191 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+from src.llm.compiler import estimate_tokens
+
+# bullet glyphs (and a bare dash or asterisk) leading a line
+BULLET_PATTERN = re.compile(r"^\s*[•◦▪▫‣●○■□►▶➢➤✓✔·*\-–—]+\s+")
+# lines that are only a page number, e.g. "3", "page 3", "3 of 4", "- 3 -"
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?#+(\s*(of|/)\s*#+)?$")
+
+# lines at the top and bottom of each page considered for headers and footers
+EDGE_LINES = 2
+
+
+class CompactedText:
+    """Compacted resume text with a map back to the original offsets."""
+
+    def __init__(self, text: str, original: str, segments: List[Tuple[int, int, int]]):
+        self.text = text
+        self.original = original
+        # (compacted offset, original offset, length) of each run copied verbatim
+        self.segments = segments
+        self._starts = [segment[0] for segment in segments]
+        self.original_tokens = estimate_tokens(original)
+        self.tokens = estimate_tokens(text)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+    def original_offset(self, offset: int) -> int:
+        """Offset in the original text of a character in the compacted text."""
+        index = bisect_right(self._starts, offset) - 1
+        if index < 0:
+            return 0
+        start, original_start, length = self.segments[index]
+        return original_start + min(offset - start, length)
+
+    def original_span(self, start: int, end: int) -> str:
+        """The original text behind a span of the compacted text."""
+        return self.original[self.original_offset(start) : self.original_offset(end)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "original_chars": len(self.original),
+            "chars": len(self.text),
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+def _line_key(line: str) -> str:
+    return line.casefold()
+
+
+def _edge_key(line: str, page: int, page_count: int) -> str:
+    # "page 2 of 3" should match "page 3 of 3", but dates must still differ;
+    # only standalone numbers count, not the "1" of a "+1 555" phone number
+    numbers = {str(page + 1), str(page_count)}
+    return re.sub(
+        r"(?<![^\s/])\d+(?![^\s/])",
+        lambda number: "#" if number.group(0) in numbers else number.group(0),
+        line.casefold(),
+    )
+
+
+def _read_lines(text: str):
+    """Yield (page, blank_before, runs) for every non-empty line.
+
+    runs are the (original offset, text) of each whitespace-separated word
+    left after dropping a leading bullet.
+    """
+    page = 0
+    last_end = 0
+    for match in re.finditer(r"[^\n\f]+", text):
+        gap = text[last_end : match.start()]
+        page += gap.count("\f")
+        blank_before = gap.count("\n") > 1 or "\f" in gap
+        last_end = match.end()
+
+        line = match.group(0)
+        bullet = BULLET_PATTERN.match(line)
+        content_start = bullet.end() if bullet else 0
+        runs = [
+            (match.start() + run.start(), run.group(0))
+            for run in re.finditer(r"\S+", line[content_start:])
+        ]
+        # offsets above are relative to the content, not the line
+        runs = [(offset + content_start, word) for offset, word in runs]
+        if runs:
+            yield page, blank_before, runs
+
+
+def _page_edges(lines) -> List[Tuple[str, int]]:
+    """(side, index) of the lines within EDGE_LINES of a page's top or bottom."""
+    pages: Dict[int, List[int]] = {}
+    for index, (page, _, _) in enumerate(lines):
+        pages.setdefault(page, []).append(index)
+
+    edges = []
+    for indexes in pages.values():
+        edges.extend(("top", index) for index in indexes[:EDGE_LINES])
+        edges.extend(("bottom", index) for index in indexes[-EDGE_LINES:])
+    return edges
+
+
+def _boilerplate(lines) -> set:
+    """Indexes of repeated page headers/footers and bare page numbers."""
+    page_count = lines[-1][0] + 1 if lines else 0
+    if page_count < 2:
+        return set()
+
+    edges = []
+    pages_with_key: Dict[Tuple[str, str], set] = {}
+    for side, index in _page_edges(lines):
+        page = lines[index][0]
+        key = _edge_key(" ".join(word for _, word in lines[index][2]), page, page_count)
+        edges.append((side, index, key))
+        pages_with_key.setdefault((side, key), set()).add(lines[index][0])
+
+    # the same line at the top (or bottom) of at least half the pages, and
+    # at least two, is a running header (or footer); its first occurrence is
+    # kept, since a name or contact line is often repeated as the header
+    threshold = max(2, page_count // 2)
+    dropped = set()
+    for side, index, key in edges:
+        page = lines[index][0]
+        if page == 0:
+            # the first page is never trimmed
+            continue
+        pages = pages_with_key[(side, key)]
+        if len(pages) >= threshold and page > min(pages):
+            dropped.add(index)
+        elif PAGE_NUMBER_PATTERN.match(key.strip("-–— ")):
+            dropped.add(index)
+    return dropped
+
+
+def compact_resume_text(text: str) -> CompactedText:
+    """Deterministically shrink extracted resume text before prompting.
+
+    Collapses whitespace, strips bullet glyphs, drops later repeats of running
+    page headers and footers and page numbers after the first page, and drops
+    a line repeating the one before it.
+    Paragraph breaks are kept as a single blank line.
+    """
+    lines = list(_read_lines(text))
+    dropped = _boilerplate(lines)
+
+    out: List[str] = []
+    segments: List[Tuple[int, int, int]] = []
+    length = 0
+    previous_key = None
+    pending_blank = False
+
+    for index, (_, blank_before, runs) in enumerate(lines):
+        pending_blank = pending_blank or blank_before
+        if index in dropped:
+            continue
+
+        key = _line_key(" ".join(word for _, word in runs))
+        if key == previous_key:
+            continue
+        previous_key = key
+
+        if out:
+            separator = "\n\n" if pending_blank else "\n"
+            out.append(separator)
+            length += len(separator)
+        pending_blank = False
+
+        for position, (offset, word) in enumerate(runs):
+            if position:
+                out.append(" ")
+                length += 1
+            segments.append((length, offset, len(word)))
+            out.append(word)
+            length += len(word)
+
+    return CompactedText("".join(out), text, segments)
+
+
+if __name__ == "__main__":
+    import sys
+
+    with open(sys.argv[1], encoding="utf-8") as file:
+        compacted = compact_resume_text(file.read())
+    print(compacted.text)
+    print(compacted.stats(), file=sys.stderr)
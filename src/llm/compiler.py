@@ -0,0 +1,244 @@
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from src.llm import prompts as default_prompts
+
+RESPOND_MARKER = "Respond in the following JSON format:"
+# stated once at the very end of the combined prompt; the app's prompt only
+# gained it when app and cli started sharing one template (and cache entries)
+NO_FENCES_PREFIX = "Do NOT wrap anything in ```json``` tags"
+
+RESUME_SECTIONS = [
+    ("Basic Details", "BASIC_DETAILS_PROMPT"),
+    ("Education", "EDUCATION_PROMPT"),
+    ("Experience", "EXPERIENCE_PROMPT"),
+    ("Skills", "SKILLS_PROMPT"),
+    ("Certifications", "CERTIFICATIONS_PROMPT"),
+    ("Projects", "PROJECTS_PROMPT"),
+]
+
+# top-level key each section prompt answers with
+SECTION_KEYS = {
+    "BASIC_DETAILS_PROMPT": "basic_details",
+    "EDUCATION_PROMPT": "education",
+    "EXPERIENCE_PROMPT": "experience",
+    "SKILLS_PROMPT": "skills",
+    "CERTIFICATIONS_PROMPT": "certifications",
+    "PROJECTS_PROMPT": "projects",
+}
+
+COMBINED_STRUCTURE = """{
+    "basic_details": { ... },
+    "education": [ ... ],
+    "experience": [ ... ],
+    "skills": { ... },
+    "certifications": [ ... ],
+    "projects": [ ... ]
+}"""
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for english prose and json
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def compact_schema(schema: str) -> str:
+    schema = re.sub(r"\s*\n\s*", " ", schema.strip())
+    schema = re.sub(r"([\[{]) ", r"\1", schema)
+    return re.sub(r" ([\]}])", r"\1", schema)
+
+
+def split_section_prompt(prompt: str) -> Tuple[str, str, List[str]]:
+    """Split a section prompt into its intro, json schema and instructions."""
+    intro, _, rest = prompt.partition(RESPOND_MARKER)
+    rest = rest.strip()
+
+    # the schema is the first balanced {...} block after the marker
+    depth = 0
+    end = 0
+    for index, char in enumerate(rest):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                end = index + 1
+                break
+
+    schema = rest[:end]
+    instructions = [line.strip() for line in rest[end:].splitlines() if line.strip()]
+    return intro.strip(), schema, instructions
+
+
+def restrict_schema_fields(schema: str, fields) -> str:
+    """Drop the members of a flat json schema object that aren't in fields."""
+    lines = []
+    for line in schema.splitlines():
+        match = re.match(r'\s*"([^"]+)":\s*"', line)
+        if match and match.group(1) not in fields:
+            continue
+        lines.append(line)
+
+    # the last remaining member of each object can't keep its trailing comma
+    for index, line in enumerate(lines[:-1]):
+        if line.rstrip().endswith(",") and lines[index + 1].strip().startswith("}"):
+            lines[index] = line.rstrip()[:-1]
+    return "\n".join(lines)
+
+
+class CompiledPrompt:
+    """A prompt assembled once, with the input text appended per request."""
+
+    def __init__(self, name: str, template: str):
+        self.name = name
+        self.template = template
+        self.static_tokens = estimate_tokens(template)
+
+    def render(self, input_text: str) -> str:
+        return self.template + input_text
+
+    def input_tokens(self, input_text: str) -> int:
+        return estimate_tokens(input_text)
+
+    def total_tokens(self, input_text: str) -> int:
+        return self.static_tokens + self.input_tokens(input_text)
+
+
+def _instruction_counts(sections) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for _, _, instructions in sections:
+        for instruction in instructions:
+            counts[instruction] = counts.get(instruction, 0) + 1
+    return counts
+
+
+@lru_cache(maxsize=None)
+def compile_resume_prompt(
+    prompts=default_prompts,
+    compact: bool = False,
+    basic_fields: Optional[Tuple[str, ...]] = None,
+):
+    """The combined resume prompt.
+
+    basic_fields limits basic_details to the fields still needed from the
+    model, for when the rest were already extracted locally.
+    """
+    sections = []
+    for title, attribute in RESUME_SECTIONS:
+        _, schema, instructions = split_section_prompt(getattr(prompts, attribute))
+        if basic_fields is not None and attribute == "BASIC_DETAILS_PROMPT":
+            schema = restrict_schema_fields(schema, basic_fields)
+        sections.append(
+            (title, compact_schema(schema) if compact else schema, instructions)
+        )
+
+    # instructions repeated across sections are stated once as shared rules
+    counts = _instruction_counts(sections)
+    shared_rules = []
+    for instruction, count in counts.items():
+        if count > 1 and not instruction.startswith(NO_FENCES_PREFIX):
+            shared_rules.append(instruction)
+
+    blocks = []
+    for number, (title, schema, instructions) in enumerate(sections, start=1):
+        local_rules = [
+            instruction
+            for instruction in instructions
+            if counts[instruction] == 1 and not instruction.startswith(NO_FENCES_PREFIX)
+        ]
+        block = f"{number}. {title}:\n{schema}"
+        if local_rules:
+            block += "\n\n" + "\n".join(local_rules)
+        blocks.append(block)
+
+    sections_text = "\n\n".join(blocks)
+    structure = compact_schema(COMBINED_STRUCTURE) if compact else COMBINED_STRUCTURE
+    rules = "\n".join(f"- {rule}" for rule in shared_rules)
+    no_fences = next(
+        instruction
+        for instruction in counts
+        if instruction.startswith(NO_FENCES_PREFIX)
+    )
+
+    template = f"""{prompts.SYSTEM_PROMPT.strip()}
+
+Your task is to extract ALL the following information from the resume in a single JSON response:
+
+{sections_text}
+
+Rules for every section:
+{rules}
+
+Combine all sections into a single JSON response with the following structure:
+{structure}
+
+{no_fences}
+
+Resume text:
+"""
+    name = "resume_compact" if compact else "resume"
+    if basic_fields is not None:
+        name += "_hybrid"
+    return CompiledPrompt(name, template)
+
+
+@lru_cache(maxsize=None)
+def compile_job_description_prompt(prompts=default_prompts, compact: bool = False):
+    _, schema, instructions = split_section_prompt(prompts.JOB_DESCRIPTION_PROMPT)
+    if compact:
+        schema = compact_schema(schema)
+
+    body = "\n\n".join([f"{RESPOND_MARKER}\n{schema}", "\n".join(instructions)])
+    template = f"""{prompts.SYSTEM_PROMPT.strip()}
+
+Your task is to extract structured information from the job description:
+
+{body}
+
+Job Description Text:
+"""
+    return CompiledPrompt(
+        "job_description_compact" if compact else "job_description", template
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_section_prompts(prompts=default_prompts, compact: bool = False):
+    """One standalone prompt per resume section, keyed by its json key."""
+    compiled = {}
+    for _, attribute in RESUME_SECTIONS:
+        intro, schema, instructions = split_section_prompt(getattr(prompts, attribute))
+        if compact:
+            schema = compact_schema(schema)
+
+        body = "\n\n".join(
+            [intro, f"{RESPOND_MARKER}\n{schema}", "\n".join(instructions)]
+        )
+        template = f"""{prompts.SYSTEM_PROMPT.strip()}
+
+{body}
+
+Resume text:
+"""
+        key = SECTION_KEYS[attribute]
+        compiled[key] = CompiledPrompt(key, template)
+    return compiled
+
+
+# assembled once at import; the per-request cost is a single concatenation
+RESUME_PROMPT = compile_resume_prompt()
+COMPACT_RESUME_PROMPT = compile_resume_prompt(compact=True)
+JOB_DESCRIPTION_PROMPT = compile_job_description_prompt()
+COMPACT_JOB_DESCRIPTION_PROMPT = compile_job_description_prompt(compact=True)
+
+
+if __name__ == "__main__":
+    for compiled in [
+        RESUME_PROMPT,
+        COMPACT_RESUME_PROMPT,
+        JOB_DESCRIPTION_PROMPT,
+        COMPACT_JOB_DESCRIPTION_PROMPT,
+    ]:
+        print(f"{compiled.name}: ~{compiled.static_tokens} static prefix tokens")
@@ -0,0 +1,114 @@
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from src.llm import prompts as default_prompts
+from src.llm.compiler import compile_resume_prompt
+from src.llm.settings import COMPACT_PROMPTS
+
+# basic_details fields, in the order of BASIC_DETAILS_PROMPT
+BASIC_FIELDS = (
+    "full_name",
+    "email",
+    "phone",
+    "location",
+    "linkedin",
+    "github",
+    "portfolio",
+    "summary",
+)
+
+# kept here rather than on BasicResumeParser, whose output shape is public
+_GITHUB_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9-]+/?", re.IGNORECASE
+)
+
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_basic_parser():
+    """Process-wide BasicResumeParser, so the spacy model loads once."""
+    global _parser
+
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                from src.step2.basic_parser import BasicResumeParser
+
+                _parser = BasicResumeParser()
+    return _parser
+
+
+def _extract_github(text: str) -> Optional[str]:
+    match = _GITHUB_PATTERN.search(text)
+    if match:
+        url = match.group(0)
+        if not url.startswith("http"):
+            url = "https://" + url
+        return url
+
+    return None
+
+
+def extract_basic_details(resume_text: str) -> Dict[str, str]:
+    """basic_details fields the regex and NER extractors filled confidently."""
+    parser = get_basic_parser()
+    found = {
+        "full_name": parser.extract_name(resume_text),
+        "email": parser.extract_email(resume_text),
+        "phone": parser.extract_phone(resume_text),
+        "linkedin": parser.extract_linkedin(resume_text),
+        "github": _extract_github(resume_text),
+    }
+
+    # a lone token from NER is as likely a company or a heading as a name
+    if found["full_name"] and len(found["full_name"].split()) < 2:
+        found["full_name"] = None
+
+    # the loose phone patterns also match dates and id numbers
+    if found["phone"] and not 10 <= len(re.sub(r"\D", "", found["phone"])) <= 15:
+        found["phone"] = None
+
+    return {field: value for field, value in found.items() if value}
+
+
+def hybrid_resume_template(
+    known: Dict[str, str], prompts=default_prompts, compact: bool = COMPACT_PROMPTS
+) -> str:
+    """The combined resume prompt, asking only for basic_details still missing."""
+    missing = tuple(field for field in BASIC_FIELDS if field not in known)
+    return compile_resume_prompt(prompts, compact, missing).template
+
+
+def prepare_hybrid_prompt(
+    resume_text: str, prompts=default_prompts, compact: bool = COMPACT_PROMPTS
+) -> Tuple[str, Dict[str, str]]:
+    known = extract_basic_details(resume_text)
+    return hybrid_resume_template(known, prompts, compact), known
+
+
+def merge_basic_details(
+    basic_details: Optional[Dict[str, Any]], known: Dict[str, str]
+) -> Dict[str, Any]:
+    basic_details = basic_details or {}
+    merged = {
+        field: known[field] if field in known else basic_details[field]
+        for field in BASIC_FIELDS
+        if field in known or field in basic_details
+    }
+    # keep anything extra the model volunteered
+    for field, value in basic_details.items():
+        merged.setdefault(field, value)
+    return merged
+
+
+def merge_hybrid_response(
+    parsed_response: Dict[str, Any], known: Dict[str, str]
+) -> Dict[str, Any]:
+    """Fill the locally extracted fields into a parsed hybrid response."""
+    merged = dict(parsed_response)
+    merged["basic_details"] = merge_basic_details(
+        parsed_response.get("basic_details"), known
+    )
+    return merged
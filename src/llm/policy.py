@@ -0,0 +1,331 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.llm.backends import LLMBackend
+from src.llm.settings import REQUEST_TIMEOUT_SECONDS
+from src.telemetry.spans import percentile
+
+# threads running blocking attempts and hedges; more requests than this wait
+# for a free thread, which doesn't count against their timeout
+MAX_IN_FLIGHT = int(os.getenv("RESUME_PARSER_LLM_MAX_IN_FLIGHT", "32"))
+MAX_RETRIES = int(os.getenv("RESUME_PARSER_LLM_RETRIES", "3"))
+BACKOFF_BASE_SECONDS = float(os.getenv("RESUME_PARSER_LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX_SECONDS = float(os.getenv("RESUME_PARSER_LLM_BACKOFF_MAX", "8"))
+# a duplicate request is sent once an attempt outlives this percentile of
+# recent latencies, and the first good answer wins
+HEDGING = os.getenv("RESUME_PARSER_LLM_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("RESUME_PARSER_LLM_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("RESUME_PARSER_LLM_HEDGE_MIN_SAMPLES", "20"))
+
+LATENCY_WINDOW = 200
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class AttemptTimeout(Exception):
+    pass
+
+
+def is_timeout(error: Exception) -> bool:
+    if isinstance(error, (AttemptTimeout, TimeoutError)):
+        return True
+
+    import httpx
+
+    return isinstance(error, httpx.TimeoutException)
+
+
+def _close_stream(opened) -> None:
+    close = getattr(opened[0], "close", None)
+    if close is not None:
+        close()
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (AttemptTimeout, TimeoutError, ConnectionError)):
+        return True
+
+    # BackendError carries the http status as .status, google-genai's
+    # APIError as .code (its .status is the status name)
+    for attribute in ("status", "code"):
+        status = getattr(error, attribute, None)
+        if isinstance(status, int):
+            return status in RETRYABLE_STATUSES
+
+    from src.llm.client import is_connection_error
+
+    return is_connection_error(error)
+
+
+class PolicyBackend(LLMBackend):
+    """Wraps a backend with retries and hedging.
+
+    Blocking calls rely on the http clients' request timeouts; async calls
+    also get a per-attempt deadline.
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        timeout: float = REQUEST_TIMEOUT_SECONDS,
+        retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        backoff_max: float = BACKOFF_MAX_SECONDS,
+        hedging: bool = HEDGING,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        hedge_min_samples: int = HEDGE_MIN_SAMPLES,
+    ):
+        self.backend = backend
+        self.name = backend.name
+        self.requires_api_key = backend.requires_api_key
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+        self.counts = {
+            "requests": 0,
+            "attempts": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+        }
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        # streams hedge on the time to their first chunk, not the whole answer
+        self._first_chunk_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        # attempts run here so a hedge can race the original request
+        self._pool = ThreadPoolExecutor(
+            max_workers=MAX_IN_FLIGHT, thread_name_prefix="llm-attempt"
+        )
+
+    def cache_model(self, model: str) -> str:
+        return self.backend.cache_model(model)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += amount
+
+    def _observe(self, seconds: float, latencies: Optional[deque] = None) -> None:
+        with self._lock:
+            (self._latencies if latencies is None else latencies).append(seconds)
+
+    def hedge_delay(self, latencies: Optional[deque] = None) -> Optional[float]:
+        """Seconds before a duplicate request, None until there's history."""
+        if not self.hedging:
+            return None
+        latencies = self._latencies if latencies is None else latencies
+        with self._lock:
+            if len(latencies) < self.hedge_min_samples:
+                return None
+            return percentile(latencies, self.hedge_percentile)
+
+    def backoff(self, retry: int) -> float:
+        # full jitter: uniform over [0, min(max, base * 2^retry)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**retry))
+
+    def _timed(self, model: str, prompt: str):
+        start = time.perf_counter()
+        text = self.backend.generate(model, prompt)
+        return text, time.perf_counter() - start
+
+    def _race(
+        self,
+        call: Callable[[], Any],
+        latencies: deque,
+        discard: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """Run call on the pool, duplicated once it outlives the hedge delay.
+
+        call returns (value, seconds). The first good value wins; discard is
+        given the value of every other call that still succeeds.
+        """
+        self._count("attempts")
+        primary = self._pool.submit(call)
+        in_flight = {primary}
+        hedge = None
+        error = None
+
+        # the delay is measured from submission, so a queued request may be
+        # hedged early; that only costs a duplicate, never a false timeout
+        delay = self.hedge_delay(latencies)
+        if delay is not None and delay < self.timeout:
+            done, _ = wait(in_flight, timeout=delay)
+            if not done:
+                self._count("hedges_fired")
+                hedge = self._pool.submit(call)
+                in_flight.add(hedge)
+
+        # a failure only ends the attempt once nothing else is in flight
+        winner = None
+        while in_flight and winner is None:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                elif winner is None:
+                    winner = future
+                elif discard is not None:
+                    discard(future.result()[0])
+
+        if winner is None:
+            if is_timeout(error):
+                self._count("timeouts")
+            raise error
+
+        if discard is not None:
+
+            def discard_late(future):
+                if future.exception() is None:
+                    discard(future.result()[0])
+
+            for future in in_flight:
+                future.add_done_callback(discard_late)
+        value, seconds = winner.result()
+        self._observe(seconds, latencies)
+        if winner is hedge:
+            self._count("hedges_won")
+        return value
+
+    def _attempt(self, model: str, prompt: str) -> str:
+        return self._race(lambda: self._timed(model, prompt), self._latencies)
+
+    def generate(self, model: str, prompt: str) -> str:
+        self._count("requests")
+        for retry in range(self.retries + 1):
+            try:
+                text = self._attempt(model, prompt)
+                self._count("successes")
+                return text
+            except Exception as e:
+                if retry == self.retries or not is_retryable(e):
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                time.sleep(self.backoff(retry))
+
+    def _open_stream(self, model: str, prompt: str):
+        """A stream and its first non-empty chunk, None if it ended without one."""
+        start = time.perf_counter()
+        chunks = iter(self.backend.stream(model, prompt))
+        try:
+            first = next((chunk for chunk in chunks if chunk), None)
+        except BaseException:
+            _close_stream((chunks, None))
+            raise
+        return (chunks, first), time.perf_counter() - start
+
+    def stream(self, model: str, prompt: str) -> Iterator[str]:
+        # a stream is retried, and hedged, until its first chunk is handed to
+        # the caller; after that the partial response can't be replayed. the
+        # gap between chunks is bounded by the http client's read timeout
+        self._count("requests")
+        for retry in range(self.retries + 1):
+            try:
+                chunks, first = self._race(
+                    lambda: self._open_stream(model, prompt),
+                    self._first_chunk_latencies,
+                    discard=_close_stream,
+                )
+            except Exception as e:
+                if retry == self.retries or not is_retryable(e):
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                time.sleep(self.backoff(retry))
+                continue
+
+            try:
+                if first is not None:
+                    yield first
+                    for chunk in chunks:
+                        yield chunk
+            except Exception as e:
+                if is_timeout(e):
+                    self._count("timeouts")
+                self._count("failures")
+                raise
+            finally:
+                _close_stream((chunks, None))
+            self._count("successes")
+            return
+
+    async def _atimed(self, model: str, prompt: str):
+        start = time.perf_counter()
+        text = await self.backend.agenerate(model, prompt)
+        return text, time.perf_counter() - start
+
+    async def _aattempt(self, model: str, prompt: str) -> str:
+        self._count("attempts")
+        primary = asyncio.ensure_future(self._atimed(model, prompt))
+        tasks = {primary}
+        hedge = None
+        error = None
+        deadline = time.monotonic() + self.timeout
+
+        try:
+            delay = self.hedge_delay()
+            if delay is not None and delay < self.timeout:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self._count("hedges_fired")
+                    hedge = asyncio.ensure_future(self._atimed(model, prompt))
+                    tasks.add(hedge)
+
+            while tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count("timeouts")
+                    raise AttemptTimeout(f"no response within {self.timeout:.0f}s")
+
+                done, tasks = await asyncio.wait(
+                    tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        text, seconds = task.result()
+                        self._observe(seconds)
+                        if task is hedge:
+                            self._count("hedges_won")
+                        return text
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def agenerate(self, model: str, prompt: str) -> str:
+        self._count("requests")
+        for retry in range(self.retries + 1):
+            try:
+                text = await self._aattempt(model, prompt)
+                self._count("successes")
+                return text
+            except Exception as e:
+                if retry == self.retries or not is_retryable(e):
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                await asyncio.sleep(self.backoff(retry))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.counts)
+            latencies = list(self._latencies)
+
+        if latencies:
+            for percent in (50, 95, 99):
+                stats[f"p{percent}_seconds"] = round(percentile(latencies, percent), 3)
+        return stats
@@ -0,0 +1,221 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.llm.compiler import SECTION_KEYS
+from src.llm.streaming import SectionStreamParser
+from src.llm.templates import extract_json_text
+from src.telemetry.spans import span
+
+RESUME_KEYS = tuple(SECTION_KEYS.values())
+JOB_DESCRIPTION_KEYS = (
+    "job_details",
+    "requirements",
+    "responsibilities",
+    "benefits",
+    "technologies",
+)
+
+# how many earlier cut points to try when the tail of a truncated response
+# doesn't parse
+MAX_CUT_ATTEMPTS = 64
+
+# fresh requests after a response that couldn't be repaired locally
+REPAIR_RETRIES = 1
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+
+def _close(out: List[str], stack: List[str]) -> str:
+    out = list(out)
+    _strip_trailing_comma(out)
+    text = "".join(out).rstrip()
+    if text.endswith(":"):
+        # a dangling "key": has no value, so drop the key too
+        key_end = text[:-1].rstrip()
+        text = key_end[: key_end.rfind('"', 0, len(key_end) - 1)].rstrip()
+        if text.endswith(","):
+            text = text[:-1]
+    return text + "".join(reversed(stack))
+
+
+def _scan(text: str) -> Tuple[str, Optional[List[Tuple[List[str], List[str]]]]]:
+    """Copy the first top-level object out of text, dropping trailing commas.
+
+    Returns the object and None when it closes; for a truncated object,
+    returns it closed as-is (None when it was cut off mid-value) plus earlier
+    cut points, latest first, each a copy of the output and the open
+    brackets at that point.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    cuts: List[Tuple[List[str], List[str]]] = []
+    in_string = False
+    escape = False
+
+    start = text.find("{")
+    if start < 0:
+        raise json.JSONDecodeError("no json object in response", text, 0)
+
+    for char in text[start:]:
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "{[":
+            out.append(char)
+            stack.append("}" if char == "{" else "]")
+            cuts.append((list(out), list(stack)))
+        elif char in "}]":
+            _strip_trailing_comma(out)
+            # trust the bracket we opened over a mismatched closer
+            out.append(stack.pop())
+            if not stack:
+                # prose or a fence after the object is ignored
+                return "".join(out), None
+        elif char == ",":
+            cuts.append((list(out), list(stack)))
+            out.append(char)
+        else:
+            out.append(char)
+
+    # truncated: a string or number cut off part way ("C" for "Computer
+    # Science", 20 for 2019) would look valid, so only cut points are tried;
+    # otherwise close every open bracket as-is
+    tail = "".join(out).rstrip()
+    if in_string or (tail and tail[-1] not in '"{[:,'):
+        closed = None
+    else:
+        closed = _close(out, stack)
+
+    cuts.reverse()
+    return closed, cuts[:MAX_CUT_ATTEMPTS]
+
+
+def _repair(response_text: str) -> Tuple[Any, bool]:
+    closed, cuts = _scan(response_text)
+    if cuts is None:
+        return json.loads(closed), False
+
+    last_error = json.JSONDecodeError(
+        "response cut off before any complete value", response_text, 0
+    )
+    if closed is not None:
+        try:
+            return json.loads(closed), True
+        except json.JSONDecodeError as error:
+            last_error = error
+
+    for out, stack in cuts:
+        try:
+            return json.loads(_close(out, stack)), True
+        except json.JSONDecodeError as error:
+            last_error = error
+    raise last_error
+
+
+def repair_json(response_text: str) -> Any:
+    """Best-effort parse of malformed model output.
+
+    Handles prose or fences around the object, trailing commas and responses
+    cut off mid-object, keeping every complete value before the cut. Raises
+    json.JSONDecodeError when nothing can be recovered.
+    """
+    return _repair(response_text)[0]
+
+
+def parse_json_response(
+    response_text: str, expected_keys: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """Parse a model response, repairing it locally when it isn't valid json.
+
+    Returns {"result", "repaired", "truncated", "salvaged", "missing"}:
+    salvaged lists the top-level sections that only parsed after repair,
+    missing the expected sections that couldn't be recovered at all. Raises
+    json.JSONDecodeError when the response can't be repaired into an object.
+    """
+    try:
+        return {
+            "result": json.loads(extract_json_text(response_text)),
+            "repaired": False,
+            "truncated": False,
+            "salvaged": [],
+            "missing": [],
+        }
+    except json.JSONDecodeError as error:
+        original_error = error
+
+    try:
+        result, truncated = _repair(response_text)
+    except json.JSONDecodeError:
+        raise original_error
+
+    if not isinstance(result, dict) or not result:
+        raise original_error
+
+    # sections that were already complete and valid in the raw response
+    stream = SectionStreamParser()
+    stream.feed(response_text)
+    salvaged = [
+        key
+        for key, value in result.items()
+        if key not in stream.sections or stream.sections[key] != value
+    ]
+
+    return {
+        "result": result,
+        "repaired": True,
+        "truncated": truncated,
+        "salvaged": salvaged,
+        "missing": [key for key in expected_keys if key not in result],
+    }
+
+
+def is_complete(parsed: Dict[str, Any]) -> bool:
+    """Whether a parse can be cached: nothing was cut off or lost."""
+    return not parsed["truncated"] and not parsed["missing"]
+
+
+def request_json(
+    request: Callable[[int], str],
+    expected_keys: Sequence[str] = (),
+    retries: int = REPAIR_RETRIES,
+) -> Dict[str, Any]:
+    """Call request(attempt) for response text until it parses.
+
+    A response is only requested again when local repair couldn't recover
+    it; the last json.JSONDecodeError is raised once retries run out.
+    """
+    for attempt in range(retries + 1):
+        with span("llm", attempt=attempt):
+            response_text = request(attempt)
+        try:
+            with span("json_decode", attempt=attempt):
+                return parse_json_response(response_text, expected_keys)
+        except json.JSONDecodeError as error:
+            last_error = error
+    raise last_error
+
+
+def describe_repair(parsed: Dict[str, Any]) -> Optional[str]:
+    """Which sections a repaired parse fixed up or lost, None if neither."""
+    parts = []
+    if parsed["salvaged"]:
+        parts.append(f"repaired: {', '.join(parsed['salvaged'])}")
+    if parsed["missing"]:
+        parts.append(f"missing: {', '.join(parsed['missing'])}")
+    return "; ".join(parts) or None
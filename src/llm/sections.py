@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from src.concurrency.singleflight import get_single_flight
+from src.llm import prompts as default_prompts
+from src.llm.cache import get_response_cache
+from src.llm.backends import get_backend
+from src.llm.compiler import compile_section_prompts
+from src.llm.repair import is_complete, parse_json_response
+from src.llm.settings import COMPACT_PROMPTS
+
+# extra attempts for sections that failed, each re-sending only those sections
+SECTION_RETRIES = 1
+
+
+def _parse_section(
+    key: str, template: str, resume_text: str, model: str, backend, cache
+) -> Any:
+    parsed_response = cache.get(backend.cache_model(model), template, resume_text)
+    if parsed_response is None:
+        # the same section of the same text is only requested once at a time
+        response_text, _ = get_single_flight("llm").do(
+            cache.key(backend.cache_model(model), template, resume_text),
+            lambda: backend.generate(model, template + resume_text),
+        )
+        # a section that can't be repaired locally fails and is retried
+        parsed = parse_json_response(response_text, [key])
+        parsed_response = parsed["result"]
+        if parsed["truncated"] and key not in parsed_response:
+            raise ValueError(f"response was cut off before {key}")
+        if is_complete(parsed):
+            cache.put(
+                backend.cache_model(model), template, resume_text, parsed_response
+            )
+
+    # section prompts answer with {"<key>": ...}; tolerate a bare value too
+    if isinstance(parsed_response, dict) and key in parsed_response:
+        return parsed_response[key]
+    return parsed_response
+
+
+def parse_resume_sections(
+    resume_text: str,
+    model: str,
+    prompts=default_prompts,
+    backend=None,
+    retries: int = SECTION_RETRIES,
+    compact: bool = COMPACT_PROMPTS,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Request every resume section concurrently and merge the answers.
+
+    Returns the merged result, in the same shape as the combined prompt, and
+    the error for each section that still failed after its retries.
+    """
+    backend = backend or get_backend()
+    section_prompts = compile_section_prompts(prompts, compact)
+    cache = get_response_cache()
+
+    merged: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    pending: List[str] = list(section_prompts)
+
+    with ThreadPoolExecutor(max_workers=len(section_prompts)) as pool:
+        for _ in range(retries + 1):
+            futures = {
+                key: pool.submit(
+                    _parse_section,
+                    key,
+                    section_prompts[key].template,
+                    resume_text,
+                    model,
+                    backend,
+                    cache,
+                )
+                for key in pending
+            }
+
+            pending = []
+            for key, future in futures.items():
+                try:
+                    merged[key] = future.result()
+                    errors.pop(key, None)
+                except Exception as e:
+                    errors[key] = str(e)
+                    pending.append(key)
+
+            if not pending:
+                break
+
+    # keep the combined prompt's section order
+    ordered = {key: merged[key] for key in section_prompts if key in merged}
+    return ordered, errors
@@ -0,0 +1,21 @@
+import os
+
+# the one model setting, app/config.py re-exports it for the app
+LLM_MODEL = os.getenv("LLM_MODEL", "gemma-3-27b-it")
+
+# enforced by the http clients, so it bounds each connect, write and wait for
+# the next chunk of a response, never time spent queued before a request
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSER_LLM_TIMEOUT", "90"))
+
+# minified json schemas in the prompts, trading readability for input tokens
+COMPACT_PROMPTS = os.getenv("RESUME_PARSER_COMPACT_PROMPTS", "0") == "1"
+
+# whitespace, bullets, page headers/footers and repeated lines are stripped
+# from the extracted text before it goes into a prompt
+COMPACT_TEXT = os.getenv("RESUME_PARSER_COMPACT_TEXT", "1") == "1"
+
+# "combined" sends one prompt for the whole resume, "sections" sends the six
+# section prompts concurrently and retries only the ones that fail, "hybrid"
+# fills contact details with regex/NER and asks the model for the rest
+LLM_MODES = ("combined", "sections", "hybrid")
+LLM_MODE = os.getenv("RESUME_PARSER_LLM_MODE", "combined")
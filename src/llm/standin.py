@@ -0,0 +1,285 @@
+# local stand-in for the llm api, replaying recorded responses over http:
+#
+#   python -m src.llm.standin --recordings recordings.jsonl --latency-ms 800
+#
+# record with RESUME_PARSER_LLM_RECORD=recordings.jsonl against the live api,
+# replay with RESUME_PARSER_LLM_BACKEND=standin. a prompt gets its exact
+# recording, else one recorded under the same template, else any recording.
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.llm.backends import prompt_template, recording_key
+
+
+class Recordings:
+    def __init__(self, paths):
+        self.by_prompt: Dict[str, str] = {}
+        self.by_template: Dict[str, List[str]] = {}
+        self.texts: List[str] = []
+
+        for path in paths:
+            path = Path(path)
+            files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+            for file_path in files:
+                with open(file_path, encoding="utf-8") as file:
+                    for line in file:
+                        if line.strip():
+                            self.add(json.loads(line))
+
+        self._any = itertools.cycle(self.texts) if self.texts else None
+        self._template_cycles = {
+            key: itertools.cycle(texts) for key, texts in self.by_template.items()
+        }
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, str]) -> None:
+        self.by_prompt[record["prompt_sha256"]] = record["text"]
+        self.by_template.setdefault(record["template_sha256"], []).append(
+            record["text"]
+        )
+        self.texts.append(record["text"])
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def match(self, prompt: str) -> Tuple[Optional[str], str]:
+        """The response text for a prompt and how it was matched."""
+        text = self.by_prompt.get(recording_key(prompt))
+        if text is not None:
+            return text, "exact"
+
+        with self._lock:
+            cycle = self._template_cycles.get(recording_key(prompt_template(prompt)))
+            if cycle is not None:
+                return next(cycle), "template"
+            if self._any is not None:
+                return next(self._any), "any"
+        return None, "none"
+
+
+class StandInState:
+    """Recordings, fault injection settings and request counters."""
+
+    def __init__(
+        self,
+        recordings: Recordings,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        requests_per_minute: Optional[float] = None,
+        chars_per_second: Optional[float] = None,
+        chunk_chars: int = 64,
+        seed: Optional[int] = None,
+    ):
+        self.recordings = recordings
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.chars_per_second = chars_per_second
+        self.chunk_chars = chunk_chars
+        self.random = random.Random(seed)
+        self.counts = {"requests": 0, "errors": 0, "throttled": 0, "unmatched": 0}
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def throttled(self) -> bool:
+        """Sliding one-minute window over accepted requests."""
+        if not self.requests_per_minute:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.requests_per_minute:
+                return True
+            self._recent.append(now)
+        return False
+
+    def failed(self) -> bool:
+        with self._lock:
+            return self.random.random() < self.error_rate
+
+    def latency(self) -> float:
+        with self._lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def generation_seconds(self, text: str) -> float:
+        if not self.chars_per_second:
+            return 0.0
+        return len(text) / self.chars_per_second
+
+
+def make_handler(state: StandInState):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body, headers=None) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send_json(404, {"error": "not found"})
+                return
+            with state._lock:
+                counts = dict(state.counts)
+            self._send_json(
+                200, {"status": "ok", "recordings": len(state.recordings), **counts}
+            )
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            if self.path not in ("/generate", "/stream"):
+                self._send_json(404, {"error": "not found"})
+                return
+
+            state.count("requests")
+            if state.throttled():
+                state.count("throttled")
+                self._send_json(
+                    429, {"error": "rate limit exceeded"}, {"Retry-After": "1"}
+                )
+                return
+
+            time.sleep(state.latency())
+
+            if state.failed():
+                state.count("errors")
+                self._send_json(503, {"error": "injected failure"})
+                return
+
+            text, matched = state.recordings.match(request.get("prompt", ""))
+            if text is None:
+                state.count("unmatched")
+                self._send_json(404, {"error": "no recording for prompt"})
+                return
+
+            if self.path == "/generate":
+                time.sleep(state.generation_seconds(text))
+                self._send_json(200, {"text": text}, {"X-Standin-Match": matched})
+            else:
+                self._stream(text, matched)
+
+        def _stream(self, text: str, matched: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("X-Standin-Match", matched)
+            self.end_headers()
+
+            for start in range(0, len(text), state.chunk_chars):
+                chunk = text[start : start + state.chunk_chars]
+                time.sleep(state.generation_seconds(chunk))
+                data = chunk.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+    return StandInHandler
+
+
+def serve(state: StandInState, host: str = "127.0.0.1", port: int = 8765):
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay recorded llm responses")
+    parser.add_argument(
+        "--recordings",
+        nargs="+",
+        required=True,
+        help="recordings .jsonl files or directories of them",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0,
+        help="time to first byte of every response",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0,
+        help="uniform +/- noise added to the latency",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="share of requests failing with a 503",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help="requests per minute before answering 429",
+    )
+    parser.add_argument(
+        "--chars-per-second",
+        type=float,
+        default=None,
+        help="simulated generation speed of the response text. Default: instant",
+    )
+    parser.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=64,
+        help="characters per chunk on the streaming endpoint",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    recordings = Recordings(args.recordings)
+    state = StandInState(
+        recordings,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        requests_per_minute=args.rpm,
+        chars_per_second=args.chars_per_second,
+        chunk_chars=args.chunk_chars,
+        seed=args.seed,
+    )
+    server = serve(state, args.host, args.port)
+    print(f"replaying {len(recordings)} recordings on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
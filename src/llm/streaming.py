@@ -0,0 +1,109 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.llm.templates import extract_json_text
+
+
+class SectionStreamParser:
+    """Incremental parser for a streamed top-level JSON object.
+
+    Text is fed in arbitrary chunks; every member of the outer object is
+    returned as a (key, value) pair as soon as its value is complete, without
+    waiting for the rest of the response. Anything before the opening brace,
+    such as a ```json fence, is skipped.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.sections: Dict[str, Any] = {}
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        # what the outer object expects next: key, colon, value, in_value, comma
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        completed = []
+
+        text = self.text
+        for index in range(self._pos, len(text)):
+            char = text[index]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key":
+                        self._key = json.loads(text[self._key_start : index + 1])
+                        self._expect = "colon"
+                continue
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._depth == 0:
+                # the outer object is closed; ignore a trailing fence
+                break
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = index
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = index
+                    self._expect = "in_value"
+            elif char in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._value_start = index
+                    self._expect = "in_value"
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "in_value":
+                    # an object or array value just closed
+                    self._complete(text[self._value_start : index + 1], completed)
+                elif self._depth == 0 and self._expect == "in_value":
+                    # a scalar was the last member
+                    self._complete(text[self._value_start : index], completed)
+            elif self._depth == 1:
+                if char == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif char == ",":
+                    if self._expect == "in_value":
+                        self._complete(text[self._value_start : index], completed)
+                    self._expect = "key"
+                elif self._expect == "value" and not char.isspace():
+                    self._value_start = index
+                    self._expect = "in_value"
+
+        self._pos = len(text)
+        return completed
+
+    def _complete(self, value_text: str, completed: List[Tuple[str, Any]]) -> None:
+        self._expect = "comma"
+        try:
+            value = json.loads(value_text)
+        except json.JSONDecodeError:
+            # left for result() to report against the whole response
+            return
+        self.sections[self._key] = value
+        completed.append((self._key, value))
+
+    def result(self) -> Dict[str, Any]:
+        """The whole response, parsed once the stream has ended.
+
+        Raises json.JSONDecodeError if the streamed text is not valid JSON.
+        """
+        return json.loads(extract_json_text(self.text))
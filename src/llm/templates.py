@@ -0,0 +1,28 @@
+from src.llm import prompts as default_prompts
+from src.llm.compiler import compile_job_description_prompt, compile_resume_prompt
+from src.llm.settings import COMPACT_PROMPTS
+
+
+def resume_prompt_template(prompts=default_prompts, compact=COMPACT_PROMPTS) -> str:
+    """Everything in the resume prompt except the resume text, which is appended."""
+    return compile_resume_prompt(prompts, compact).template
+
+
+def job_description_prompt_template(
+    prompts=default_prompts, compact=COMPACT_PROMPTS
+) -> str:
+    """Everything in the job description prompt except the text, which is appended."""
+    return compile_job_description_prompt(prompts, compact).template
+
+
+def extract_json_text(response_text: str) -> str:
+    # models sometimes wrap the object in ```json fences despite the prompt
+    response_text = response_text.strip()
+    if response_text.startswith("```json"):
+        start_marker = "```json"
+        end_marker = "```"
+        start_idx = response_text.find(start_marker) + len(start_marker)
+        end_idx = response_text.rfind(end_marker)
+        if end_idx > start_idx:
+            response_text = response_text[start_idx:end_idx].strip()
+    return response_text
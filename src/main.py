@@ -5,120 +5,230 @@ sys.path.append("./")
 
 import json
 import argparse
+import asyncio
 from pathlib import Path
 
-import spacy
-from spacy_layout import spaCyLayout
-from google import genai
-from src.llm.prompts import (
-    SYSTEM_PROMPT,
-    BASIC_DETAILS_PROMPT,
-    EDUCATION_PROMPT,
-    EXPERIENCE_PROMPT,
-    SKILLS_PROMPT,
-    CERTIFICATIONS_PROMPT,
-    PROJECTS_PROMPT,
+from src.extraction.batch import extract_batch, find_resume_files
+from src.llm.backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from src.llm.cache import get_response_cache
+from src.llm.compaction import compact_resume_text
+from src.llm.compiler import estimate_tokens
+from src.llm.settings import COMPACT_TEXT, LLM_MODE, LLM_MODEL, LLM_MODES
+from src.llm.repair import RESUME_KEYS, describe_repair, is_complete, request_json
+from src.llm.templates import resume_prompt_template
+from src.telemetry.spans import (
+    format_breakdown,
+    get_histograms,
+    record_span,
+    set_telemetry_path,
+    span,
+    trace,
 )
 
 
-def extract_text_from_resume(file_path):
+def extract_text_from_resume(file_path, tier=None):
+    from src.extraction.engine import get_engine
+
     try:
-        # process document with spacy layout
-        nlp = spacy.blank("en")
-        layout = spaCyLayout(nlp)
-        doc = layout(str(file_path))
-        return doc.text
+        # cheap pdfminer/docx2txt first, shared spacy layout pipeline if needed
+        with span("extraction") as attributes:
+            result = get_engine().extract(file_path, tier=tier)
+            attributes["tier"] = result["tier"]
+        print(f"extraction tier: {result['tier']}")
+        return result["text"]
 
     except Exception as e:
         print(f"error processing file: {e}")
         return None
 
 
-def parse_resume(resume_path):
-    resume_text = extract_text_from_resume(resume_path)
+def compact_text(resume_text):
+    with span("compaction"):
+        compacted = compact_resume_text(resume_text)
+    print(
+        f"compacted resume text: ~{compacted.original_tokens} -> ~{compacted.tokens}"
+        f" tokens ({compacted.saved_tokens} saved)"
+    )
+    return compacted.text
+
+
+def parse_resume(
+    resume_path,
+    resume_text=None,
+    tier=None,
+    mode=LLM_MODE,
+    compact=COMPACT_TEXT,
+    backend=None,
+):
+    if resume_text is None:
+        resume_text = extract_text_from_resume(resume_path, tier=tier)
     if not resume_text:
         print("failed to extract text from resume")
         return None
 
     print(f"extracted text from resume ({len(resume_text)} characters)")
+    if compact:
+        resume_text = compact_text(resume_text)
+
+    backend = get_backend(backend)
+    if mode == "sections":
+        return parse_resume_by_section(resume_path, resume_text, backend)
 
     # combine all prompts into full request
-    full_prompt = f"""{SYSTEM_PROMPT}
+    known = None
+    with span("prompt", mode=mode):
+        if mode == "hybrid":
+            from src.llm.hybrid import prepare_hybrid_prompt
+
+            template, known = prepare_hybrid_prompt(resume_text)
+        else:
+            template = resume_prompt_template()
+        full_prompt = template + resume_text
+    if known is not None:
+        print(f"filled locally: {', '.join(known) or 'none'}")
+    print(
+        f"prompt size: ~{estimate_tokens(template)} static prefix tokens"
+        f" + ~{estimate_tokens(resume_text)} resume tokens"
+    )
 
-Your task is to extract ALL the following information from the resume in a single JSON response:
+    # identical resume text under an unchanged prompt was parsed before
+    cache = get_response_cache()
+    with span("cache_lookup") as attributes:
+        parsed_response = cache.get(
+            backend.cache_model(LLM_MODEL), template, resume_text
+        )
+        attributes["hit"] = parsed_response is not None
+    if parsed_response is not None:
+        print("using cached llm response")
+        return save_parsed_resume(resume_path, merge_known(parsed_response, known))
 
-1. Basic Details:
-{BASIC_DETAILS_PROMPT.replace("As a resume parser, your job is to extract basic personal details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
+    def request(attempt):
+        if attempt:
+            print("response could not be repaired, requesting again")
+        return backend.generate(LLM_MODEL, full_prompt)
 
-2. Education:
-{EDUCATION_PROMPT.replace("As a resume parser, your job is to extract education details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
+    try:
+        try:
+            parsed = request_json(request, RESUME_KEYS)
+        except json.JSONDecodeError as e:
+            print(f"error parsing json response: {e}")
+            print(f"raw response: {e.doc}")
+            return None
 
-3. Experience:
-{EXPERIENCE_PROMPT.replace("As a resume parser, your job is to extract work experience details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
+        repair_summary = describe_repair(parsed)
+        if repair_summary:
+            print(f"recovered a malformed response ({repair_summary})")
+        if is_complete(parsed):
+            cache.put(
+                backend.cache_model(LLM_MODEL), template, resume_text, parsed["result"]
+            )
+        return save_parsed_resume(resume_path, merge_known(parsed["result"], known))
 
-4. Skills:
-{SKILLS_PROMPT.replace("As a resume parser, your job is to extract skills from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
+    except Exception as e:
+        print(f"error during llm processing: {e}")
+        return None
 
-5. Certifications:
-{CERTIFICATIONS_PROMPT.replace("As a resume parser, your job is to extract certifications and licenses from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
 
-6. Projects:
-{PROJECTS_PROMPT.replace("As a resume parser, your job is to extract project details from resumes provided as plain text.", "").replace("Respond in the following JSON format:", "").strip()}
+def merge_known(parsed_response, known):
+    if known is None:
+        return parsed_response
 
-Combine all sections into a single JSON response with the following structure:
-{{
-    "basic_details": {{ ... }},
-    "education": [ ... ],
-    "experience": [ ... ],
-    "skills": {{ ... }},
-    "certifications": [ ... ],
-    "projects": [ ... ]
-}}
+    from src.llm.hybrid import merge_hybrid_response
 
-Do NOT wrap anything in ```json``` tags, and only respond with the JSON object. Make sure to include the outer curly braces.
+    return merge_hybrid_response(parsed_response, known)
 
-Resume text:
-{resume_text}"""
 
-    client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+def parse_resume_by_section(resume_path, resume_text, backend):
+    from src.llm.sections import parse_resume_sections
 
-    try:
-        response = client.models.generate_content(
-            model="gemma-3-27b-it", contents=full_prompt
+    # the sections run on their own threads, so they're timed as one stage
+    with span("llm", mode="sections"):
+        parsed_response, errors = parse_resume_sections(
+            resume_text, LLM_MODEL, backend=backend
         )
+    for section, error in errors.items():
+        print(f"error parsing section {section}: {error}")
 
-        try:
-            # extract json from response
-            response_text = response.text.strip()
-            if response_text.startswith("```json"):
-                start_marker = "```json"
-                end_marker = "```"
-                start_idx = response_text.find(start_marker) + len(start_marker)
-                end_idx = response_text.rfind(end_marker)
-                if end_idx > start_idx:
-                    response_text = response_text[start_idx:end_idx].strip()
-
-            parsed_response = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            print(f"error parsing json response: {e}")
-            print(f"raw response: {response.text}")
-            return None
+    if not parsed_response:
+        return None
+    return save_parsed_resume(resume_path, parsed_response)
 
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
 
-        resume_name = Path(resume_path).stem
-        output_path = output_dir / f"output_{resume_name}.json"
+def save_parsed_resume(resume_path, parsed_response):
+    output_dir = Path("output")
+    output_dir.mkdir(exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as file:
-            json.dump(parsed_response, file, indent=2, ensure_ascii=False)
+    resume_name = Path(resume_path).stem
+    output_path = output_dir / f"output_{resume_name}.json"
 
-        print(f"resume parsing completed. results saved to: {output_path}")
-        return parsed_response
+    with span("save"), open(output_path, "w", encoding="utf-8") as file:
+        json.dump(parsed_response, file, indent=2, ensure_ascii=False)
 
-    except Exception as e:
-        print(f"error during llm processing: {e}")
-        return None
+    print(f"resume parsing completed. results saved to: {output_path}")
+    return parsed_response
+
+
+async def parse_as_extracted(resume_paths, max_workers, tier, compact, llm_options):
+    from src.llm.async_engine import AsyncParseEngine
+
+    engine = AsyncParseEngine(**llm_options)
+    loop = asyncio.get_running_loop()
+    extracted = asyncio.Queue()
+
+    # the extraction pool is drained on a thread so the event loop can
+    # start each llm parse as soon as its text is ready
+    def extract():
+        try:
+            for item in extract_batch(resume_paths, max_workers=max_workers, tier=tier):
+                loop.call_soon_threadsafe(extracted.put_nowait, item)
+        finally:
+            loop.call_soon_threadsafe(extracted.put_nowait, None)
+
+    extraction = loop.run_in_executor(None, extract)
+    results = {}
+    paths = []
+
+    async def texts():
+        while True:
+            item = await extracted.get()
+            if item is None:
+                break
+            record_span("extraction", item["seconds"], tier=item["tier"])
+            if item["error"] or not item["text"]:
+                results[item["path"]] = None
+                continue
+            if compact:
+                with span("compaction"):
+                    item["text"] = compact_resume_text(item["text"]).text
+            paths.append(item["path"])
+            yield item["text"]
+        await extraction
+
+    async for parsed in engine.parse_many(texts()):
+        resume_path = paths[parsed["index"]]
+        if parsed["error"]:
+            print(f"error during llm processing of {resume_path}: {parsed['error']}")
+            results[resume_path] = None
+        else:
+            results[resume_path] = save_parsed_resume(resume_path, parsed["result"])
+    return results
+
+
+def parse_directory(
+    directory, max_workers=None, tier=None, llm_options=None, compact=COMPACT_TEXT
+):
+    resume_paths = find_resume_files(directory)
+    if not resume_paths:
+        print(f"no .pdf or .docx files found in: {directory}")
+        return {}
+
+    print(f"extracting and parsing {len(resume_paths)} resumes")
+
+    # extraction fans out over a process pool, and llm parsing keeps several
+    # requests in flight under the rate limits while later files extract
+    return asyncio.run(
+        parse_as_extracted(resume_paths, max_workers, tier, compact, llm_options or {})
+    )
 
 
 def main():
@@ -127,7 +237,76 @@ def main():
         "resume_path",
         nargs="?",
         default="files/soham_resume.pdf",
-        help="path to the resume file (.pdf or .docx). Default: files/soham_resume.pdf",
+        help="path to the resume file (.pdf or .docx) or a directory of resumes. Default: files/soham_resume.pdf",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of extraction processes when parsing a directory. Default: cpu count",
+    )
+    parser.add_argument(
+        "--tier",
+        choices=["auto", "fast", "layout"],
+        default=None,
+        help="text extraction tier. auto tries pdfminer/docx2txt before the layout model. Default: auto",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=LLM_MODES,
+        default=None,
+        help="combined sends one prompt per resume, sections sends the six section prompts concurrently, hybrid fills contact details locally first. Single resumes only. Default: combined",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=list(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help="llm backend. standin replays recorded responses from a local server (python -m src.llm.standin). Default: gemini",
+    )
+    parser.add_argument(
+        "--no-compact",
+        dest="compact",
+        action="store_false",
+        default=COMPACT_TEXT,
+        help="send the extracted text as-is instead of stripping whitespace, bullets and page boilerplate first",
+    )
+    parser.add_argument(
+        "--queue",
+        action="store_true",
+        help="process through the durable job queue; re-running after a crash resumes where it stopped",
+    )
+    parser.add_argument(
+        "--queue-db",
+        default=None,
+        help="job queue database for --queue. Default: .cache/jobs.sqlite3",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print how long each stage took (per-stage percentiles for a directory)",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=os.getenv("RESUME_PARSER_TELEMETRY"),
+        help="append every timed stage to this file as json lines",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="llm requests in flight when parsing a directory. Default: 8",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help="llm requests per minute limit when parsing a directory",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=float,
+        default=None,
+        help="llm input tokens per minute limit when parsing a directory",
     )
 
     args = parser.parse_args()
@@ -135,9 +314,76 @@ def main():
     if not os.path.exists(args.resume_path):
         print(f"error: resume file not found: {args.resume_path}")
         sys.exit(1)
+    set_telemetry_path(args.telemetry)
+
+    # directories and the job queue always send one combined prompt per resume
+    batch = args.queue or os.path.isdir(args.resume_path)
+    if batch and args.mode not in (None, "combined"):
+        parser.error(f"--mode {args.mode} only applies to a single resume")
+    if batch and LLM_MODE != "combined":
+        print(f"RESUME_PARSER_LLM_MODE={LLM_MODE} ignored, using combined prompts")
+
+    if args.queue:
+        from src.jobs.worker import run_queue
+
+        paths = (
+            find_resume_files(args.resume_path)
+            if os.path.isdir(args.resume_path)
+            else [args.resume_path]
+        )
+        counts = run_queue(
+            paths,
+            workers=args.workers,
+            tier=args.tier,
+            compact=args.compact,
+            backend_name=args.backend,
+            queue_path=args.queue_db,
+            telemetry_path=args.telemetry,
+        )
+        print(f"\njob states: {json.dumps(counts)}")
+        if counts["failed"] or counts["queued"]:
+            sys.exit(1)
+        return
+
+    if os.path.isdir(args.resume_path):
+        print(f"processing resumes in: {args.resume_path}")
+        results = parse_directory(
+            args.resume_path,
+            max_workers=args.workers,
+            tier=args.tier,
+            compact=args.compact,
+            llm_options={
+                "backend": get_backend(args.backend),
+                "concurrency": args.concurrency,
+                "requests_per_minute": args.rpm,
+                "tokens_per_minute": args.tpm,
+            },
+        )
+        failed = [path for path, result in results.items() if not result]
+
+        print(f"\nparsed {len(results) - len(failed)}/{len(results)} resumes")
+        for path in failed:
+            print(f"failed: {path}")
+        print(f"llm requests: {json.dumps(get_backend(args.backend).stats())}")
+        if args.timings:
+            print(f"stage timings: {json.dumps(get_histograms().summary(), indent=2)}")
+
+        if failed or not results:
+            sys.exit(1)
+        return
 
     print(f"processing resume: {args.resume_path}")
-    result = parse_resume(args.resume_path)
+    with trace("resume", document=args.resume_path) as current:
+        result = parse_resume(
+            args.resume_path,
+            tier=args.tier,
+            mode=args.mode or LLM_MODE,
+            compact=args.compact,
+            backend=args.backend,
+        )
+    if args.timings:
+        print("\nstage timings:")
+        print(format_breakdown(current.breakdown(), current.seconds))
 
     if result:
         print("\nextracted resume details:")
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.llm.cache import DEFAULT_CACHE_DIR, PROMPTS_VERSION
+
+DEFAULT_TTL_SECONDS = int(os.getenv("RESUME_PARSER_MATCH_CACHE_TTL_DAYS", "30")) * 86400
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESUME_PARSER_MATCH_CACHE_MAX_ENTRIES", "200000"))
+# entries also kept in memory, so a popular job description never touches disk
+MEMORY_ENTRIES = int(os.getenv("RESUME_PARSER_MATCH_CACHE_MEMORY_ENTRIES", "4096"))
+
+JOB_DESCRIPTION = "job_description"
+EMBEDDING = "embedding"
+SIMILARITY = "similarity"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def content_hash(content) -> str:
+    """sha256 of raw bytes, text, or json-serializable parsed data."""
+    if isinstance(content, bytes):
+        return hashlib.sha256(content).hexdigest()
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return _sha256(content)
+
+
+class MatchStore:
+    """Parsed job descriptions, text embeddings and similarity results.
+
+    Everything is keyed by content hashes, so entries are shared by every
+    session in the process (in memory) and by later processes (SQLite, with
+    a TTL and least-recently-used eviction past a size cap).
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = MEMORY_ENTRIES,
+    ):
+        self.path = Path(path or Path(DEFAULT_CACHE_DIR) / "match_store.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # one short-lived connection per call, as in the llm response cache
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _remember(self, kind: str, key: str, value) -> None:
+        with self._lock:
+            self._memory[(kind, key)] = value
+            self._memory.move_to_end((kind, key))
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _get_many(self, kind: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                value = self._memory.get((kind, key))
+                if value is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end((kind, key))
+                    found[key] = value
+
+        if missing:
+            now = time.time()
+            with closing(self._connect()) as connection, connection:
+                for key in missing:
+                    row = connection.execute(
+                        "SELECT value, created_at FROM entries WHERE kind = ? AND key = ?",
+                        (kind, key),
+                    ).fetchone()
+                    if row is None or now - row[1] > self.ttl_seconds:
+                        continue
+                    connection.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?",
+                        (now, kind, key),
+                    )
+                    found[key] = row[0]
+                    self._remember(kind, key, row[0])
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _put_many(self, kind: str, values: Dict[str, bytes]) -> None:
+        if not values:
+            return
+        now = time.time()
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                [(kind, key, value, now, now) for key, value in values.items()],
+            )
+            self._evict(connection, now)
+        for key, value in values.items():
+            self._remember(kind, key, value)
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute(
+            "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        connection.execute(
+            """
+            DELETE FROM entries WHERE rowid IN (
+                SELECT rowid FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def _job_description_key(self, jd_hash: str, model: str) -> str:
+        # a prompt edit or another model means a different parse
+        return _sha256("\0".join([jd_hash, model, PROMPTS_VERSION]))
+
+    def get_job_description(self, jd_hash: str, model: str) -> Optional[Dict[str, Any]]:
+        """{"parsed", "text"} for a job description's content hash, or None."""
+        key = self._job_description_key(jd_hash, model)
+        value = self._get_many(JOB_DESCRIPTION, [key]).get(key)
+        return None if value is None else json.loads(value)
+
+    def put_job_description(
+        self, jd_hash: str, model: str, parsed: Dict[str, Any], text: str
+    ) -> None:
+        value = json.dumps({"parsed": parsed, "text": text}, ensure_ascii=False)
+        self._put_many(
+            JOB_DESCRIPTION, {self._job_description_key(jd_hash, model): value}
+        )
+
+    def get_embeddings(self, model: str, texts: Iterable[str]) -> Dict[str, Any]:
+        """Cached embedding vectors by text, for the texts that have one."""
+        import numpy as np
+
+        keys = {_sha256(f"{model}\0{text}"): text for text in texts}
+        found = self._get_many(EMBEDDING, keys)
+        return {
+            keys[key]: np.frombuffer(value, dtype=np.float32)
+            for key, value in found.items()
+        }
+
+    def put_embeddings(self, model: str, embeddings: Dict[str, Any]) -> None:
+        import numpy as np
+
+        self._put_many(
+            EMBEDDING,
+            {
+                _sha256(f"{model}\0{text}"): np.asarray(
+                    vector, dtype=np.float32
+                ).tobytes()
+                for text, vector in embeddings.items()
+            },
+        )
+
+    def _similarity_key(self, resume_hash: str, jd_hash: str, model: str) -> str:
+        return _sha256("\0".join([resume_hash, jd_hash, model]))
+
+    def get_similarity(
+        self, resume_hash: str, jd_hash: str, model: str
+    ) -> Optional[Dict[str, Any]]:
+        key = self._similarity_key(resume_hash, jd_hash, model)
+        value = self._get_many(SIMILARITY, [key]).get(key)
+        return None if value is None else json.loads(value)
+
+    def put_similarity(
+        self, resume_hash: str, jd_hash: str, model: str, result: Dict[str, Any]
+    ) -> None:
+        self._put_many(
+            SIMILARITY,
+            {self._similarity_key(resume_hash, jd_hash, model): json.dumps(result)},
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with closing(self._connect()) as connection:
+            (entries,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "in_memory": len(self._memory),
+            }
+
+
+_store: Optional[MatchStore] = None
+_store_lock = threading.Lock()
+
+
+def get_match_store() -> MatchStore:
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MatchStore()
+    return _store
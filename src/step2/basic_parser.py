@@ -1,12 +1,22 @@
 import re
+import sys
 import spacy
 from typing import Optional, Dict, Any
-from pdfminer.high_level import extract_text
-import docx2txt
+
+sys.path.append("./")
+from src.extraction.cache import cached_extract
+from src.extraction.plain import extract_docx_text, extract_pdf_text
+from src.extraction.streaming import extract_text_prefix
 
 
 class BasicResumeParser:
-    def __init__(self):
+    def __init__(
+        self, max_pages: Optional[int] = None, max_chars: Optional[int] = None
+    ):
+        # contact details sit at the top of a resume, so callers can cap how
+        # much of a long document is laid out at all
+        self.max_pages = max_pages
+        self.max_chars = max_chars
         try:
             self.nlp = spacy.load("en_core_web_sm")
         except OSError:
@@ -15,10 +25,17 @@ class BasicResumeParser:
     def extract_text_from_file(self, file_path: str) -> str:
         file_path_lower = file_path.lower()
 
+        if file_path_lower.endswith((".pdf", ".docx")) and (
+            self.max_pages or self.max_chars
+        ):
+            return extract_text_prefix(
+                file_path, max_pages=self.max_pages, max_chars=self.max_chars
+            )
+
         if file_path_lower.endswith(".pdf"):
-            return extract_text(file_path)
+            return cached_extract(file_path, "pdfminer", extract_pdf_text)
         elif file_path_lower.endswith(".docx"):
-            return docx2txt.process(file_path)
+            return cached_extract(file_path, "docx2txt", extract_docx_text)
         else:
             raise ValueError("unsupported file format. only PDF and DOCX supported.")
 
@@ -133,8 +150,6 @@ def extract_linkedin(text: str) -> Optional[str]:
 
 # test with sample resume
 if __name__ == "__main__":
-    import sys
-
     parser = BasicResumeParser()
 
     if len(sys.argv) > 1:
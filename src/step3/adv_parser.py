@@ -1,10 +1,13 @@
 import re
+import sys
 import spacy
 from typing import Dict, List, Any
 import nltk
 from nltk.corpus import stopwords
-from pdfminer.high_level import extract_text
-import docx2txt
+
+sys.path.append("./")
+from src.extraction.cache import cached_extract
+from src.extraction.plain import extract_docx_text, extract_pdf_text
 
 
 class AdvancedResumeParser:
@@ -41,9 +44,9 @@ class AdvancedResumeParser:
         file_path_lower = file_path.lower()
 
         if file_path_lower.endswith(".pdf"):
-            return extract_text(file_path)
+            return cached_extract(file_path, "pdfminer", extract_pdf_text)
         elif file_path_lower.endswith(".docx"):
-            return docx2txt.process(file_path)
+            return cached_extract(file_path, "docx2txt", extract_docx_text)
         else:
             raise ValueError("unsupported file format")
 
@@ -665,8 +668,6 @@ class AdvancedResumeParser:
 
 # test parser
 if __name__ == "__main__":
-    import sys
-
     # check for debug flag
     debug_mode = "--debug" in sys.argv or "-d" in sys.argv
     if debug_mode:
@@ -0,0 +1,221 @@
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# every finished span and trace is appended here as a json line when set
+TELEMETRY_PATH = os.getenv("RESUME_PARSER_TELEMETRY")
+# the histograms keep this many recent durations per stage
+HISTOGRAM_WINDOW = 1000
+
+
+def percentile(values, percent: float) -> float:
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Histograms:
+    """Recent span durations per stage, for in-process percentiles."""
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self.window = window
+        self._durations: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = deque(maxlen=self.window)
+            durations.append(seconds)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {name: list(values) for name, values in self._durations.items()}
+            counts = dict(self._counts)
+
+        summary = {}
+        for name, values in snapshot.items():
+            summary[name] = {
+                "count": counts[name],
+                "mean_seconds": round(sum(values) / len(values), 6),
+                **{
+                    f"p{percent}_seconds": round(percentile(values, percent), 6)
+                    for percent in (50, 95, 99)
+                },
+            }
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+
+
+class Trace:
+    """The spans recorded while processing one document."""
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.spans: List[Dict[str, Any]] = []
+        self.seconds: Optional[float] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def stop(self) -> float:
+        """Freeze the total; later waits (ui delays) aren't part of the parse."""
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self._start
+        return self.seconds
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds per stage in first-seen order, repeated stages summed."""
+        stages: Dict[str, float] = {}
+        with self._lock:
+            for record in self.spans:
+                name = record["name"]
+                stages[name] = stages.get(name, 0.0) + record["seconds"]
+        return stages
+
+    def record(self) -> Dict[str, Any]:
+        return {
+            "type": "trace",
+            "trace": self.trace_id,
+            "name": self.name,
+            "seconds": round(self.stop(), 6),
+            "stages": {name: round(s, 6) for name, s in self.breakdown().items()},
+            **self.attributes,
+        }
+
+
+_histograms: Optional[Histograms] = None
+_histograms_lock = threading.Lock()
+_write_lock = threading.Lock()
+_current_trace: contextvars.ContextVar = contextvars.ContextVar(
+    "resume_parser_trace", default=None
+)
+# seconds to leave out of the innermost open span, see excluded_span
+_current_span: contextvars.ContextVar = contextvars.ContextVar(
+    "resume_parser_span", default=None
+)
+
+
+def get_histograms() -> Histograms:
+    """Process-wide stage histograms."""
+    global _histograms
+    if _histograms is None:
+        with _histograms_lock:
+            if _histograms is None:
+                _histograms = Histograms()
+    return _histograms
+
+
+def set_telemetry_path(path: Optional[str]) -> None:
+    global TELEMETRY_PATH
+    TELEMETRY_PATH = path
+
+
+def _write(record: Dict[str, Any]) -> None:
+    if not TELEMETRY_PATH:
+        return
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _write_lock, open(TELEMETRY_PATH, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def record_span(name: str, seconds: float, **attributes) -> None:
+    """Record a stage timed elsewhere, e.g. in a worker process."""
+    record = {"type": "span", "name": name, "seconds": round(seconds, 6)}
+    trace = _current_trace.get()
+    if trace is not None:
+        record["trace"] = trace.trace_id
+        trace.add({"name": name, "seconds": seconds})
+    record.update(attributes)
+
+    get_histograms().observe(name, seconds)
+    _write(record)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """Time a stage. The yielded dict takes extra attributes for the record."""
+    start = time.perf_counter()
+    excluded = [0.0]
+    token = _current_span.set(excluded)
+    try:
+        yield attributes
+    except BaseException as e:
+        attributes["error"] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        record_span(name, time.perf_counter() - start - excluded[0], **attributes)
+
+
+@contextmanager
+def excluded_span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """Time a stage as its own span and leave it out of the enclosing one.
+
+    For work done inside another stage that isn't part of it, e.g. rendering
+    sections while a streamed llm request is still open.
+    """
+    outer = _current_span.get()
+    start = time.perf_counter()
+    try:
+        with span(name, **attributes) as attributes:
+            yield attributes
+    finally:
+        if outer is not None:
+            outer[0] += time.perf_counter() - start
+
+
+@contextmanager
+def trace(name: str, **attributes) -> Iterator[Trace]:
+    """Collect the spans of one document; nested spans attach to it."""
+    current = Trace(name, **attributes)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+        current.stop()
+        get_histograms().observe("total", current.seconds)
+        _write(current.record())
+
+
+def format_breakdown(stages: Dict[str, float], total: Optional[float] = None) -> str:
+    """Stage timings as aligned text lines for the cli."""
+    if total is None:
+        total = sum(stages.values())
+    rows = list(stages.items())
+    if total:
+        other = total - sum(stages.values())
+        if other > 0.0005:
+            rows.append(("other", other))
+        rows.append(("total", total))
+
+    width = max((len(name) for name, _ in rows), default=0)
+    lines = []
+    for name, seconds in rows:
+        share = f" {seconds / total:6.1%}" if total and name != "total" else ""
+        lines.append(f"  {name:<{width}}  {seconds * 1000:9.1f} ms{share}")
+    return "\n".join(lines)
@@ -0,0 +1,83 @@
+import io
+import zipfile
+from typing import List, Sequence, Tuple
+
+# (x, y, text) in PDF points, y counted from the bottom of a 600x800 page
+Line = Tuple[int, int, str]
+
+
+def make_pdf(pages: Sequence[Sequence[Line]]) -> bytes:
+    """A minimal text PDF with one Helvetica content stream per page."""
+    objects = {}
+    font_id = 3 + 2 * len(pages)
+    kids = []
+
+    for index, lines in enumerate(pages):
+        page_id = 3 + 2 * index
+        content_id = page_id + 1
+        kids.append(page_id)
+
+        stream = b"".join(
+            b"BT /F1 10 Tf %d %d Td (%s) Tj ET\n" % (x, y, text.encode("latin-1"))
+            for x, y, text in lines
+        )
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 600 800] "
+            b"/Contents %d 0 R /Resources << /Font << /F1 %d 0 R >> >> >>"
+            % (content_id, font_id)
+        )
+        objects[content_id] = (
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(pages),
+    )
+    objects[font_id] = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(out)
+        out += b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n"
+
+    xref = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for object_id in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[object_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        size,
+        xref,
+    )
+    return out
+
+
+def text_pdf(pages: Sequence[Sequence[str]]) -> bytes:
+    """A PDF with the given lines stacked down each page."""
+    return make_pdf(
+        [
+            [(50, 750 - 15 * row, text) for row, text in enumerate(page)]
+            for page in pages
+        ]
+    )
+
+
+def make_docx(paragraphs: List[str]) -> bytes:
+    """A minimal .docx holding only word/document.xml, enough for docx2txt."""
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+        for text in paragraphs
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+        f'wordprocessingml/2006/main"><w:body>{body}</w:body></w:document>'
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
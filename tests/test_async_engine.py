@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from src.llm.async_engine import AsyncParseEngine
+from src.llm.backends import LLMBackend
+from src.llm.cache import ResponseCache
+from src.llm.repair import RESUME_KEYS
+
+
+class EchoBackend(LLMBackend):
+    """Answers every prompt with a complete resume naming the resume text."""
+
+    name = "echo"
+
+    def __init__(self):
+        self.prompts = []
+        self.called = asyncio.Event()
+
+    def generate(self, model, prompt):
+        response = {key: [] for key in RESUME_KEYS}
+        response["basic_details"] = {"full_name": prompt.rsplit("\n", 1)[-1]}
+        return json.dumps(response)
+
+    async def agenerate(self, model, prompt):
+        self.prompts.append(prompt)
+        self.called.set()
+        return self.generate(model, prompt)
+
+
+def make_engine(tmp_path):
+    return AsyncParseEngine(
+        cache=ResponseCache(tmp_path / "responses.sqlite3"), backend=EchoBackend()
+    )
+
+
+def collect(engine, texts, **kwargs):
+    async def run():
+        return [parsed async for parsed in engine.parse_many(texts, **kwargs)]
+
+    return asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+
+def test_parse_many_keeps_input_order_when_asked(tmp_path):
+    outcomes = collect(make_engine(tmp_path), ["Ann", "Bob", "Cy"], ordered=True)
+
+    assert [parsed["index"] for parsed in outcomes] == [0, 1, 2]
+    names = [parsed["result"]["basic_details"]["full_name"] for parsed in outcomes]
+    assert names == ["Ann", "Bob", "Cy"]
+
+
+def test_parse_many_starts_before_the_input_is_exhausted(tmp_path):
+    engine = make_engine(tmp_path)
+
+    async def texts():
+        yield "Ann"
+        # the second text only arrives once the first is being parsed
+        await engine.backend.called.wait()
+        yield "Bob"
+
+    outcomes = collect(engine, texts())
+
+    assert sorted(parsed["index"] for parsed in outcomes) == [0, 1]
+    assert engine.backend.prompts[0].endswith("Ann")
+
+
+def test_parse_many_reports_failures_per_text(tmp_path):
+    engine = make_engine(tmp_path)
+
+    async def agenerate(model, prompt):
+        if prompt.endswith("Bob"):
+            raise RuntimeError("quota exceeded")
+        return await EchoBackend.agenerate(engine.backend, model, prompt)
+
+    engine.backend.agenerate = agenerate
+    outcomes = {parsed["index"]: parsed for parsed in collect(engine, ["Ann", "Bob"])}
+
+    assert outcomes[0]["error"] is None
+    assert outcomes[1]["error"] == "quota exceeded"
+
+
+def test_backends_must_implement_generate():
+    class Incomplete(LLMBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,40 @@
+import pytest
+
+from documents import text_pdf
+from src.extraction import batch, engine as engine_module
+from src.extraction.cache import TextCache
+from src.extraction.engine import ExtractionEngine
+
+
+@pytest.fixture
+def broken_engine(tmp_path, monkeypatch):
+    engine = ExtractionEngine(cache=TextCache(tmp_path))
+
+    # docling failing to load, as on a machine without the layout extra
+    def broken_layout(data, file_format):
+        raise ImportError("No module named 'docling'")
+
+    monkeypatch.setattr(engine, "_extract_layout", broken_layout)
+    monkeypatch.setattr(engine_module, "get_engine", lambda: engine)
+    monkeypatch.setattr(batch, "_worker_tier", None)
+    return engine
+
+
+def test_a_failed_warm_up_is_reported_per_file(broken_engine, tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(text_pdf([["Jane Doe", "Senior engineer"]]))
+
+    # the initializer must not raise, or the pool breaks and every file is lost
+    batch._init_worker("layout")
+    assert isinstance(broken_engine.warm_error, ImportError)
+
+    result = batch.extract_file(str(resume))
+    assert result["text"] is None
+    assert "docling" in result["error"]
+
+
+def test_auto_batches_do_not_warm_the_layout_model(broken_engine):
+    batch._init_worker(None)
+
+    assert not broken_engine.warmed
+    assert broken_engine.warm_error is None
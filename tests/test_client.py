@@ -0,0 +1,24 @@
+from src.llm import client
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_reset_client_swaps_without_closing_the_shared_client(monkeypatch):
+    monkeypatch.setattr(client, "_clients", {})
+    monkeypatch.setattr(client, "_build_client", lambda api_key: FakeClient())
+
+    old = client.get_client("key")
+    assert client.get_client("key") is old
+
+    client.reset_client("key")
+    new = client.get_client("key")
+
+    # requests still running on the old client keep a usable connection pool
+    assert new is not old
+    assert not old.closed
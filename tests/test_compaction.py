@@ -0,0 +1,51 @@
+from src.llm.compaction import compact_resume_text
+
+HEADER = "Jane Doe"
+CONTACT = "jane@example.com | +1 555 010 0199"
+
+
+def page(number, body):
+    return "\n".join([HEADER, CONTACT, *body, f"Page {number} of 3"])
+
+
+def three_page_resume():
+    return "\f".join(
+        [
+            page(1, ["Experience", "- Built the billing service in Python"]),
+            page(2, ["Education", "BSc Computer Science, 2019"]),
+            page(3, ["Projects", "• Resume parser"]),
+        ]
+    )
+
+
+def test_name_and_contact_line_survive_as_a_running_header():
+    compacted = compact_resume_text(three_page_resume()).text
+    lines = compacted.splitlines()
+
+    assert lines[:2] == [HEADER, CONTACT]
+    # later repeats of the header are dropped
+    assert lines.count(HEADER) == 1
+    assert lines.count(CONTACT) == 1
+
+
+def test_page_numbers_are_dropped_after_the_first_page():
+    compacted = compact_resume_text(three_page_resume()).text
+
+    assert "Page 1 of 3" in compacted
+    assert "Page 2 of 3" not in compacted
+    assert "Page 3 of 3" not in compacted
+
+
+def test_bullets_whitespace_and_repeated_lines_are_collapsed():
+    text = "Skills\n\n\n•   Python    and   SQL\n• Python and SQL\n\n- Docker"
+
+    assert compact_resume_text(text).text == "Skills\n\nPython and SQL\n\nDocker"
+
+
+def test_offsets_map_back_to_the_original_text():
+    original = "Skills\n•   Python    and   SQL"
+    compacted = compact_resume_text(original)
+    start = compacted.text.index("Python")
+
+    assert compacted.original_span(start, start + len("Python")) == "Python"
+    assert compacted.saved_tokens >= 0
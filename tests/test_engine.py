@@ -0,0 +1,139 @@
+import pytest
+
+from documents import make_pdf, text_pdf
+from src.extraction.cache import TextCache
+from src.extraction.engine import ExtractionEngine
+from src.extraction.tiers import FAST, LAYOUT, TEXT, assess_text
+
+
+def resume_pdf(pages=1):
+    return text_pdf(
+        [
+            [
+                f"Page {page} line {row} with some reasonably long resume content"
+                for row in range(40)
+            ]
+            for page in range(pages)
+        ]
+    )
+
+
+def two_column_pdf():
+    lines = [
+        (40, 750 - 40 * row, f"Left sidebar item {row} python") for row in range(18)
+    ]
+    lines += [
+        (330, 750 - 40 * row, f"Right main column experience entry {row} detail")
+        for row in range(18)
+    ]
+    return make_pdf([lines])
+
+
+def right_aligned_dates_pdf():
+    # a single column whose job titles carry their dates flush right
+    lines = [(50, 770, "Jane Doe - Senior Software Engineer - jane@example.com")]
+    y = 740
+    for job in range(5):
+        lines.append((50, y, f"Software Engineer at Company {job}"))
+        lines.append((470, y, f"Jan 201{job} - Mar 202{job}"))
+        # the bullets run past the middle of the page, so there's no gutter
+        bullet = "- Built and operated data pipelines handling millions of events"
+        for _ in range(2):
+            y -= 14
+            lines.append((60, y, bullet))
+        y -= 26
+    return make_pdf([lines])
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = ExtractionEngine(cache=TextCache(tmp_path), parallel_min_pages=0)
+    layout_calls = []
+
+    # docling isn't needed to check which tier is picked
+    def extract_layout(data, file_format):
+        layout_calls.append(file_format)
+        return "layout text"
+
+    monkeypatch.setattr(engine, "_extract_layout", extract_layout)
+    engine.layout_calls = layout_calls
+    return engine
+
+
+def test_auto_keeps_a_clean_single_column_pdf_on_the_fast_tier(engine):
+    result = engine.extract(resume_pdf(), name="resume.pdf")
+
+    assert result["tier"] == FAST
+    assert result["reason"] is None
+    assert "line 39" in result["text"]
+    assert engine.layout_calls == []
+
+
+def test_auto_escalates_sparse_and_multi_column_pdfs(engine):
+    sparse = engine.extract(text_pdf([["Jane Doe"]]), name="scan.pdf")
+    columns = engine.extract(two_column_pdf(), name="columns.pdf")
+
+    assert (sparse["tier"], sparse["reason"]) == (LAYOUT, "sparse_text")
+    assert (columns["tier"], columns["reason"]) == (LAYOUT, "multi_column")
+    assert columns["text"] == "layout text"
+
+
+def test_right_aligned_dates_are_not_mistaken_for_columns(engine):
+    result = engine.extract(right_aligned_dates_pdf(), name="dates.pdf")
+
+    assert (result["tier"], result["reason"]) == (FAST, None)
+    assert "Jan 2014 - Mar 2024" in result["text"]
+    assert engine.layout_calls == []
+
+
+def test_explicit_tiers_are_honoured(engine):
+    sparse = text_pdf([["Jane Doe"]])
+
+    assert engine.extract(sparse, name="a.pdf", tier="fast")["tier"] == FAST
+    layout = engine.extract(resume_pdf(), name="b.pdf", tier="layout")
+    assert (layout["tier"], layout["reason"]) == (LAYOUT, "requested")
+    with pytest.raises(ValueError):
+        engine.extract(sparse, name="a.pdf", tier="fastest")
+
+
+def test_plain_text_is_decoded_without_a_document_model(engine):
+    result = engine.extract("Jane Doe\nPython".encode("utf-16"), name="jd.txt")
+
+    assert result["tier"] == TEXT
+    assert result["text"] == "Jane Doe\nPython"
+    assert engine.layout_calls == []
+
+
+def test_tier_decisions_are_cached_but_not_counted_as_text_lookups(engine, monkeypatch):
+    pdf = resume_pdf()
+    engine.extract(pdf, name="resume.pdf")
+
+    # the second run reuses both the decision and the text
+    monkeypatch.setattr(
+        engine, "_extract_fast", lambda *args: pytest.fail("fast tier rerun")
+    )
+    assert engine.extract(pdf, name="resume.pdf")["tier"] == FAST
+
+    stats = engine.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+
+
+def test_assess_text_reasons():
+    body = "\n".join(["Senior engineer building data pipelines in Python"] * 10)
+
+    assert assess_text(body) is None
+    assert assess_text("short") == "sparse_text"
+    assert assess_text(body + " (cid:12)" * 11) == "unmapped_glyphs"
+    assert assess_text("\n".join(["ab"] * 200)) == "scrambled_order"
+
+
+def test_warm_failures_are_kept_on_the_engine(engine, monkeypatch):
+    def broken_layout(data, file_format):
+        raise ImportError("No module named 'docling'")
+
+    monkeypatch.setattr(engine, "_extract_layout", broken_layout)
+
+    with pytest.raises(ImportError):
+        engine.warm()
+    assert isinstance(engine.warm_error, ImportError)
+    assert not engine.warmed
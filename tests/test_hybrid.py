@@ -0,0 +1,27 @@
+from src.llm.hybrid import _extract_github, merge_hybrid_response
+
+
+def test_github_urls_are_normalized():
+    assert _extract_github("code: github.com/janedoe") == "https://github.com/janedoe"
+    assert (
+        _extract_github("https://GitHub.com/jane-doe/")
+        == "https://GitHub.com/jane-doe/"
+    )
+    assert _extract_github("no profile here") is None
+
+
+def test_local_fields_win_over_the_model():
+    parsed = {
+        "basic_details": {"full_name": "J. Doe", "location": "Berlin", "extra": 1},
+        "skills": {"technical": ["Python"]},
+    }
+
+    merged = merge_hybrid_response(parsed, {"full_name": "Jane Doe"})
+
+    assert merged["basic_details"] == {
+        "full_name": "Jane Doe",
+        "location": "Berlin",
+        "extra": 1,
+    }
+    assert merged["skills"] == parsed["skills"]
+    assert parsed["basic_details"]["full_name"] == "J. Doe"
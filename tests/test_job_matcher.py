@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.matching.store import MatchStore
+from utils import job_matcher
+
+TEXTS = {
+    "skills_match": ("Python SQL Docker", "Python Kubernetes"),
+    "experience_match": ("Backend engineer at Acme", "Senior backend engineer"),
+    "education_match": ("BSc Computer Science", "BSc Computer Science"),
+    "empty": ("", "Python"),
+}
+
+
+class FakeModel:
+    """Bag-of-letters embeddings; the empty text embeds to a zero vector."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts):
+        self.batches.append(list(texts))
+        vectors = np.zeros((len(texts), 26), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if char.isalpha():
+                    vectors[row, ord(char) - ord("a")] += 1
+        return vectors
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    model = FakeModel()
+    store = MatchStore(tmp_path / "match_store.sqlite3")
+    monkeypatch.setattr(job_matcher, "load_sentence_transformer", lambda: model)
+    monkeypatch.setattr(job_matcher, "get_match_store", lambda: store)
+    return model
+
+
+def cosine(a, b):
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 0.0
+
+
+def test_score_pairs_matches_pairwise_cosine_similarity(model):
+    scores = job_matcher.score_pairs(TEXTS)
+
+    for name, (resume_text, jd_text) in TEXTS.items():
+        a, b = model.encode([resume_text, jd_text])
+        assert scores[name] == pytest.approx(cosine(a, b), abs=1e-6)
+    assert scores["education_match"] == pytest.approx(1.0)
+    assert scores["empty"] == 0.0
+
+
+def test_score_pairs_matches_sklearn(model):
+    pairwise = pytest.importorskip("sklearn.metrics.pairwise")
+
+    scores = job_matcher.score_pairs(TEXTS)
+
+    for name, (resume_text, jd_text) in TEXTS.items():
+        a, b = model.encode([resume_text, jd_text])
+        expected = pairwise.cosine_similarity([a], [b])[0][0]
+        assert scores[name] == pytest.approx(expected, abs=1e-6)
+
+
+def test_texts_are_embedded_once_in_a_single_batch(model):
+    job_matcher.score_pairs(TEXTS)
+    job_matcher.score_pairs(TEXTS)
+
+    # duplicates are dropped and stored embeddings are reused
+    assert len(model.batches) == 1
+    assert len(model.batches[0]) == len(set(sum(TEXTS.values(), ())))
@@ -0,0 +1,186 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from src.jobs.queue import DONE, EXTRACTING, FAILED, PARSING, QUEUED, JobQueue
+from src.jobs.worker import process_job, work
+from src.llm.backends import LLMBackend
+from src.llm.cache import ResponseCache
+from src.llm.repair import RESUME_KEYS
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / "jobs.sqlite3", output_dir=tmp_path / "output")
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Jane Doe\nPython developer")
+    return path
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = 0
+
+    def extract(self, path, tier=None):
+        self.calls += 1
+        return {"text": "Jane Doe\nPython developer", "tier": "text"}
+
+
+class FakeBackend(LLMBackend):
+    name = "fake"
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def generate(self, model, prompt):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return json.dumps({key: [] for key in RESUME_KEYS})
+
+
+def test_claim_takes_each_job_once_in_order(queue, tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        paths.append(tmp_path / f"{name}.txt")
+        paths[-1].write_text(name)
+
+    assert queue.enqueue(paths) == 2
+    first, second = queue.claim("w:1"), queue.claim("w:2")
+
+    assert first["path"].endswith("a.txt") and second["path"].endswith("b.txt")
+    assert (first["state"], first["attempts"]) == (EXTRACTING, 1)
+    assert queue.claim("w:3") is None
+
+
+def test_enqueue_skips_unchanged_files_and_restarts_changed_ones(queue, resume):
+    assert queue.enqueue([resume]) == 1
+    assert queue.enqueue([resume]) == 0
+
+    job = queue.claim()
+    queue.checkpoint_text(job["id"], "old text", "fast")
+    queue.complete(job["id"])
+    resume.write_text("Jane Doe\nRust developer")
+
+    assert queue.enqueue([resume]) == 1
+    job = queue.claim()
+    # the checkpoints belonged to the old content
+    assert job["text"] is None and job["attempts"] == 1
+
+
+def test_failed_jobs_retry_then_stay_failed(queue, resume):
+    queue = JobQueue(queue.path, output_dir=queue.output_dir, max_attempts=2)
+    queue.enqueue([resume])
+
+    job = queue.claim()
+    assert queue.fail(job["id"], "boom", job["attempts"]) == QUEUED
+    job = queue.claim()
+    assert queue.fail(job["id"], "boom", job["attempts"]) == FAILED
+    assert queue.failed_jobs()[0]["error"] == "boom"
+
+    # enqueueing again grants a fresh set of attempts
+    assert queue.enqueue([resume]) == 1
+    assert queue.claim()["attempts"] == 1
+
+
+def test_recover_requeues_dead_workers_and_expired_leases(queue, tmp_path):
+    host = socket.gethostname()
+    paths = []
+    for name in ("dead", "expired", "alive"):
+        paths.append(tmp_path / f"{name}.txt")
+        paths[-1].write_text(name)
+    queue.enqueue(paths)
+
+    dead = queue.claim(f"{host}:{dead_pid()}")
+    expired = queue.claim("elsewhere:1")
+    queue.claim(f"{host}:{os.getpid()}")
+    queue.checkpoint_text(dead["id"], "extracted", "fast")
+
+    assert queue.recover() == 1
+    expired_queue = JobQueue(queue.path, output_dir=queue.output_dir, lease_seconds=-1)
+    assert expired_queue.recover() == 2
+
+    # the dead worker's checkpoint survives, so it resumes at parsing
+    resumed = queue.claim()
+    assert resumed["id"] == dead["id"]
+    assert (resumed["state"], resumed["text"]) == (PARSING, "extracted")
+    assert queue.claim()["id"] == expired["id"]
+
+
+def test_recover_fails_jobs_that_keep_killing_their_worker(queue, resume):
+    queue = JobQueue(queue.path, output_dir=queue.output_dir, max_attempts=2)
+    host = socket.gethostname()
+    queue.enqueue([resume])
+
+    queue.claim(f"{host}:{dead_pid()}")
+    assert queue.recover() == 1
+    assert queue.counts()[QUEUED] == 1
+
+    # the second crash uses up the last attempt
+    queue.claim(f"{host}:{dead_pid()}")
+    assert queue.recover() == 1
+    assert queue.counts()[FAILED] == 1
+    assert queue.failed_jobs()[0]["error"] == "worker died"
+    assert queue.claim() is None
+
+
+def test_work_survives_a_failed_warm_up(queue, resume, monkeypatch, tmp_path):
+    from src.extraction import engine as engine_module
+    from src.llm import backends, cache
+
+    class BrokenLayoutEngine(FakeEngine):
+        default_tier = "layout"
+        parallel_min_pages = None
+
+        def warm(self):
+            raise ImportError("No module named 'docling'")
+
+        def extract(self, path, tier=None):
+            raise ImportError("No module named 'docling'")
+
+    monkeypatch.setattr(engine_module, "get_engine", BrokenLayoutEngine)
+    monkeypatch.setattr(backends, "get_backend", lambda name: FakeBackend())
+    monkeypatch.setattr(
+        cache, "get_response_cache", lambda: ResponseCache(tmp_path / "r.sqlite3")
+    )
+    queue.enqueue([resume])
+
+    # each attempt fails the job instead of killing the worker
+    work(queue.path, queue.output_dir, "layout", False, None)
+    assert queue.counts()[FAILED] == 1
+    assert "docling" in queue.failed_jobs()[0]["error"]
+
+
+def test_process_job_checkpoints_and_resumes(queue, resume, tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+    engine = FakeEngine()
+    queue.enqueue([resume])
+
+    job = queue.claim()
+    failing = FakeBackend(error=RuntimeError("quota exceeded"))
+    assert process_job(queue, job, engine, failing, cache, None, False) == QUEUED
+
+    # the retry reuses the checkpointed text instead of extracting again
+    job = queue.claim()
+    assert job["state"] == PARSING
+    assert process_job(queue, job, engine, FakeBackend(), cache, None, False) == DONE
+    assert engine.calls == 1
+
+    output = json.loads(open(job["output_path"], encoding="utf-8").read())
+    assert set(output) == set(RESUME_KEYS)
+    assert queue.counts()[DONE] == 1
@@ -0,0 +1,46 @@
+import os
+
+from documents import text_pdf
+from src.extraction.parallel import (
+    analyze_pdf_parallel,
+    count_pdf_pages,
+    page_ranges,
+    should_split,
+)
+from src.extraction.tiers import analyze_pdf
+
+
+def long_pdf(pages=10):
+    return text_pdf(
+        [
+            [f"Page {page} line {row} of a long curriculum vitae" for row in range(30)]
+            for page in range(pages)
+        ]
+    )
+
+
+def test_page_ranges_cover_every_page_once():
+    assert page_ranges(10, 4) == [range(0, 4), range(4, 8), range(8, 10)]
+    assert page_ranges(4, 4) == [range(0, 4)]
+    assert page_ranges(0, 4) == []
+
+
+def test_count_pdf_pages():
+    assert count_pdf_pages(memoryview(long_pdf(10))) == 10
+
+
+def test_parallel_layout_matches_the_serial_one():
+    pdf = long_pdf(10)
+
+    assert analyze_pdf_parallel(memoryview(pdf), pages_per_chunk=3) == analyze_pdf(
+        memoryview(pdf)
+    )
+
+
+def test_should_split_only_long_documents(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+    assert should_split(memoryview(long_pdf(10)), min_pages=8)
+    assert not should_split(memoryview(long_pdf(2)), min_pages=8)
+    assert not should_split(memoryview(long_pdf(10)), min_pages=0)
+    assert not should_split(memoryview(b"not a pdf"), min_pages=8)
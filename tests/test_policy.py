@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.llm import policy
+from src.llm.backends import BackendError, LLMBackend
+from src.llm.policy import PolicyBackend
+
+
+class ScriptedBackend(LLMBackend):
+    """Streams the chunks of one script per call; exceptions in it are raised."""
+
+    name = "scripted"
+
+    def __init__(self, *scripts):
+        self.scripts = list(scripts)
+        self.calls = 0
+        self.closed = 0
+
+    def generate(self, model, prompt):
+        return "".join(self.stream(model, prompt))
+
+    def stream(self, model, prompt):
+        script = self.scripts[min(self.calls, len(self.scripts) - 1)]
+        self.calls += 1
+        try:
+            for step in script:
+                if isinstance(step, threading.Event):
+                    step.wait(5)
+                elif isinstance(step, Exception):
+                    raise step
+                else:
+                    yield step
+        finally:
+            self.closed += 1
+
+
+def make_policy(backend, **kwargs):
+    return PolicyBackend(backend, retries=2, backoff_base=0, **kwargs)
+
+
+def test_stream_retries_until_a_chunk_reaches_the_caller():
+    backend = ScriptedBackend(
+        [ConnectionError("reset")],
+        ["", BackendError("busy", status=503)],
+        ["{", '"a": 1}'],
+    )
+    wrapped = make_policy(backend)
+
+    assert "".join(wrapped.stream("model", "prompt")) == '{"a": 1}'
+    assert backend.calls == 3
+    assert wrapped.counts["retries"] == 2
+    assert wrapped.counts["successes"] == 1
+
+
+def test_stream_errors_after_the_first_chunk_are_not_retried():
+    backend = ScriptedBackend(["{", ConnectionError("reset")], ["{}"])
+    wrapped = make_policy(backend)
+    received = []
+
+    with pytest.raises(ConnectionError):
+        for chunk in wrapped.stream("model", "prompt"):
+            received.append(chunk)
+
+    assert received == ["{"]
+    assert backend.calls == 1
+    assert wrapped.counts["failures"] == 1
+
+
+def test_a_slow_stream_is_hedged_and_the_loser_closed():
+    release = threading.Event()
+    backend = ScriptedBackend([release, "slow"], ["fast"])
+    wrapped = make_policy(backend, hedging=True, hedge_min_samples=1)
+    wrapped._first_chunk_latencies.extend([0.01] * 5)
+
+    assert "".join(wrapped.stream("model", "prompt")) == "fast"
+    assert wrapped.counts["hedges_fired"] == 1
+    assert wrapped.counts["hedges_won"] == 1
+
+    release.set()
+    wrapped._pool.shutdown(wait=True)
+    assert backend.closed == 2
+
+
+def test_queued_attempts_are_not_timed_out(monkeypatch):
+    monkeypatch.setattr(policy, "MAX_IN_FLIGHT", 1)
+    gate = threading.Event()
+    backend = ScriptedBackend([gate, "done"])
+    wrapped = make_policy(backend, timeout=0.01)
+    assert wrapped._pool._max_workers == 1
+
+    with ThreadPoolExecutor(max_workers=3) as callers:
+        results = [callers.submit(wrapped.generate, "m", "p") for _ in range(3)]
+        gate.set()
+        assert [result.result() for result in results] == ["done"] * 3
+    assert wrapped.counts["timeouts"] == 0
+
+
+def test_non_retryable_errors_fail_fast():
+    backend = ScriptedBackend([BackendError("bad request", status=400)])
+    wrapped = make_policy(backend)
+
+    with pytest.raises(BackendError):
+        wrapped.generate("model", "prompt")
+    assert backend.calls == 1
+    assert wrapped.counts["failures"] == 1
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from src.llm.repair import (
+    RESUME_KEYS,
+    is_complete,
+    parse_json_response,
+    repair_json,
+    request_json,
+)
+
+
+def test_a_string_cut_off_mid_value_is_dropped_not_closed():
+    text = '{"education": [{"degree": "BSc", "major": "C'
+
+    assert repair_json(text) == {"education": [{"degree": "BSc"}]}
+
+
+def test_a_number_cut_off_mid_value_is_dropped():
+    text = '{"skills": {"technical": ["Python", "SQL"]}, "years": 20'
+
+    assert repair_json(text) == {"skills": {"technical": ["Python", "SQL"]}}
+
+
+def test_complete_values_before_the_cut_are_kept():
+    assert repair_json('{"skills": ["Python", "Ja') == {"skills": ["Python"]}
+    assert repair_json('{"name": "Jane Doe", "email": ') == {"name": "Jane Doe"}
+    assert repair_json('{"projects": [{"name": "Parser"}, {') == {
+        "projects": [{"name": "Parser"}, {}]
+    }
+
+
+def test_prose_fences_and_trailing_commas_are_ignored():
+    text = 'Here you go:\n```json\n{"skills": ["Python",], "projects": [],}\n```'
+
+    assert repair_json(text) == {"skills": ["Python"], "projects": []}
+
+
+def test_nothing_recoverable_raises():
+    with pytest.raises(json.JSONDecodeError):
+        repair_json("no json here")
+    # cut back to an empty object, which isn't a usable response
+    assert repair_json('{"na') == {}
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_response('{"na')
+
+
+def test_parse_json_response_reports_truncation_and_missing_sections():
+    full = {key: [] for key in RESUME_KEYS}
+    valid = parse_json_response(json.dumps(full), RESUME_KEYS)
+    assert not valid["repaired"] and is_complete(valid)
+
+    truncated = parse_json_response(
+        '{"basic_details": {"full_name": "Jane Doe"}, "education": [{"major": "Co',
+        RESUME_KEYS,
+    )
+    assert truncated["truncated"] and not is_complete(truncated)
+    assert truncated["result"]["education"] == [{}]
+    assert "experience" in truncated["missing"]
+
+
+def test_request_json_only_asks_again_when_repair_fails():
+    responses = iter(["not json", '{"skills": []}'])
+    attempts = []
+
+    def request(attempt):
+        attempts.append(attempt)
+        return next(responses)
+
+    assert request_json(request, retries=1)["result"] == {"skills": []}
+    assert attempts == [0, 1]
@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.concurrency.singleflight import SingleFlight
+
+
+class Rerun(BaseException):
+    """Stands in for streamlit's RerunException."""
+
+
+def start_leader(flight, key, fn):
+    """Run fn as the leader for key on a thread, returning its future."""
+    started = threading.Event()
+
+    def lead():
+        started.set()
+        return fn()
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = pool.submit(flight.do, key, lead)
+    started.wait(5)
+    pool.shutdown(wait=False)
+    return future
+
+
+def wait_for_waiters(flight, key, count):
+    while flight._calls[key].waiters < count:
+        threading.Event().wait(0.001)
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"skills": ["Python"]}
+
+    leader = start_leader(flight, "resume", compute)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        waiters = [pool.submit(flight.do, "resume", compute) for _ in range(2)]
+        wait_for_waiters(flight, "resume", 2)
+        release.set()
+        results = [waiter.result(5) for waiter in waiters]
+
+    assert leader.result(5) == ({"skills": ["Python"]}, False)
+    assert results == [({"skills": ["Python"]}, True)] * 2
+    assert len(calls) == 1
+    # each waiter gets its own copy
+    assert results[0][0] is not results[1][0]
+    assert flight.stats() == {
+        "calls": 3,
+        "coalesced": 2,
+        "takeovers": 0,
+        "in_flight": 0,
+    }
+
+
+def test_exceptions_are_shared_with_waiters():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError("quota exceeded")
+
+    leader = start_leader(flight, "resume", compute)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        waiter = pool.submit(flight.do, "resume", compute)
+        wait_for_waiters(flight, "resume", 1)
+        release.set()
+        with pytest.raises(ValueError):
+            waiter.result(5)
+    with pytest.raises(ValueError):
+        leader.result(5)
+
+
+def test_a_waiter_takes_over_when_the_leader_is_interrupted():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def interrupted():
+        release.wait(5)
+        raise Rerun()
+
+    leader = start_leader(flight, "resume", interrupted)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        waiter = pool.submit(flight.do, "resume", lambda: "parsed")
+        wait_for_waiters(flight, "resume", 1)
+        release.set()
+
+        # the rerun stays with the leader's session
+        assert waiter.result(5) == ("parsed", False)
+    with pytest.raises(Rerun):
+        leader.result(5)
+    assert flight.stats()["takeovers"] == 1
+
+
+def test_waiters_give_up_after_the_wait_timeout():
+    flight = SingleFlight(wait_timeout=0.01)
+    release = threading.Event()
+    leader = start_leader(flight, "resume", lambda: release.wait(5))
+
+    with pytest.raises(TimeoutError):
+        flight.do("resume", lambda: "never runs")
+    release.set()
+    assert leader.result(5) == (True, False)
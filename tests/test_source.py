@@ -0,0 +1,66 @@
+import io
+
+import pytest
+
+from documents import make_docx, text_pdf
+from src.extraction.plain import extract_docx_text, extract_pdf_text
+from src.extraction.source import BufferReader, detect_format, read_source
+
+
+def test_read_source_exposes_upload_buffers_without_copying():
+    upload = io.BytesIO(b"%PDF-1.4 resume")
+    upload.name = "resume.pdf"
+
+    data, name = read_source(upload)
+    upload.getbuffer()[0:1] = b"#"
+
+    assert name == "resume.pdf"
+    # the view shares memory with the upload
+    assert bytes(data[:1]) == b"#"
+
+
+def test_buffer_reader_reads_from_the_buffer_it_wraps():
+    backing = bytearray(b"0123456789")
+    reader = BufferReader(memoryview(backing))
+    backing[0:1] = b"X"
+
+    assert reader.read(3) == b"X12"
+    assert reader.tell() == 3
+
+
+def test_buffer_reader_seeks_like_a_file():
+    reader = BufferReader(b"0123456789")
+
+    assert reader.seek(-3, io.SEEK_END) == 7
+    assert reader.read() == b"789"
+    assert reader.read(5) == b""
+    assert reader.seek(2) == 2
+    assert reader.seek(2, io.SEEK_CUR) == 4
+    assert reader.read(2) == b"45"
+    with pytest.raises(ValueError):
+        reader.seek(-1)
+
+
+def test_pdf_text_matches_a_bytesio_read():
+    from pdfminer.high_level import extract_text
+
+    pdf = text_pdf([["Jane Doe", "Python developer"], ["Second page"]])
+
+    assert extract_pdf_text(memoryview(pdf)) == extract_text(io.BytesIO(pdf))
+    assert "Second page" in extract_pdf_text(memoryview(pdf))
+
+
+def test_docx_text_reads_through_the_buffer_reader():
+    docx = make_docx(["Jane Doe", "Python developer"])
+
+    text = extract_docx_text(memoryview(docx))
+
+    assert "Jane Doe" in text
+    assert "Python developer" in text
+
+
+def test_detect_format_prefers_the_name_then_magic_bytes():
+    assert detect_format(memoryview(b"%PDF-1.4"), "resume.DOCX") == "docx"
+    assert detect_format(memoryview(b"%PDF-1.4"), None) == "pdf"
+    assert detect_format(memoryview(b"PK\x03\x04rest"), None) == "docx"
+    assert detect_format(memoryview(b"plain"), None) is None
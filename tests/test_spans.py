@@ -0,0 +1,48 @@
+import json
+import time
+
+from src.jobs.worker import run_queue
+from src.telemetry.spans import Trace, excluded_span, span, trace
+
+
+def test_excluded_spans_are_left_out_of_the_enclosing_span():
+    with trace("resume") as current:
+        with span("llm"):
+            time.sleep(0.02)
+            with excluded_span("render"):
+                time.sleep(0.05)
+
+    stages = current.breakdown()
+    assert stages["render"] >= 0.05
+    assert 0.02 <= stages["llm"] < 0.05
+
+
+def test_breakdown_sums_repeated_stages_in_first_seen_order():
+    current = Trace("resume")
+    for name, seconds in (("llm", 1.0), ("json_decode", 0.5), ("llm", 2.0)):
+        current.add({"name": name, "seconds": seconds})
+
+    assert current.breakdown() == {"llm": 3.0, "json_decode": 0.5}
+
+
+def test_queue_workers_write_to_the_telemetry_file(tmp_path, monkeypatch):
+    # workers are spawned, they only know the path if it is passed to them
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RESUME_PARSER_LLM_RETRIES", "0")
+    monkeypatch.setenv("RESUME_PARSER_STANDIN_URL", "http://127.0.0.1:9")
+    resume = tmp_path / "resume.txt"
+    resume.write_text("Jane Doe\nPython developer")
+    telemetry = tmp_path / "telemetry.jsonl"
+
+    run_queue(
+        [resume],
+        workers=1,
+        tier="fast",
+        backend_name="standin",
+        queue_path=tmp_path / "jobs.sqlite3",
+        output_dir=str(tmp_path / "output"),
+        telemetry_path=str(telemetry),
+    )
+
+    records = [json.loads(line) for line in telemetry.read_text().splitlines()]
+    assert {"extraction", "llm"} <= {record["name"] for record in records}
@@ -0,0 +1,22 @@
+from src.llm import settings
+from src.llm.compiler import NO_FENCES_PREFIX
+from src.llm.templates import extract_json_text, resume_prompt_template
+
+
+def test_app_and_cli_share_one_model_setting():
+    import config
+
+    assert config.LLM_MODEL == settings.LLM_MODEL
+
+
+def test_resume_template_asks_for_bare_json_once():
+    for compact in (False, True):
+        template = resume_prompt_template(compact=compact)
+
+        assert template.count(NO_FENCES_PREFIX) == 1
+        assert template.rstrip().endswith("Resume text:")
+
+
+def test_extract_json_text_strips_fences():
+    assert extract_json_text('```json\n{"a": 1}\n```') == '{"a": 1}'
+    assert extract_json_text(' {"a": 1} ') == '{"a": 1}'
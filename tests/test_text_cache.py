@@ -0,0 +1,76 @@
+import os
+
+from src.extraction.cache import TextCache, cached_extract
+
+
+def test_key_depends_on_content_and_extractor(tmp_path):
+    cache = TextCache(tmp_path)
+
+    assert cache.key(b"resume", "pdfminer") == cache.key(b"resume", "pdfminer")
+    assert cache.key(b"resume", "pdfminer") != cache.key(b"resume2", "pdfminer")
+    assert cache.key(b"resume", "pdfminer") != cache.key(b"resume", "docx2txt")
+
+
+def test_get_and_put_round_trip_and_count(tmp_path):
+    cache = TextCache(tmp_path)
+    key = cache.key(b"resume", "pdfminer")
+
+    assert cache.get(key) is None
+    cache.put(key, "Jane Doe\nPython")
+    assert cache.get(key) == "Jane Doe\nPython"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_cached_extract_runs_the_extractor_once(tmp_path):
+    cache = TextCache(tmp_path)
+    calls = []
+
+    def extract(data):
+        calls.append(bytes(data))
+        return "text"
+
+    assert cached_extract(b"resume", "pdfminer", extract, cache=cache) == "text"
+    assert cached_extract(b"resume", "pdfminer", extract, cache=cache) == "text"
+    assert calls == [b"resume"]
+
+
+def test_evicts_least_recently_used_past_the_size_cap(tmp_path):
+    cache = TextCache(tmp_path, max_bytes=250)
+    keys = [cache.key(str(index).encode(), "pdfminer") for index in range(3)]
+
+    for age, key in enumerate(keys):
+        cache.put(key, "x" * 100)
+        # oldest first, one second apart, so the lru order is unambiguous
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) == "x" * 100
+    assert cache.get(keys[2]) == "x" * 100
+    assert cache.stats()["bytes"] <= 250
+
+
+def test_put_only_scans_the_directory_when_over_budget(tmp_path, monkeypatch):
+    cache = TextCache(tmp_path, max_bytes=10_000)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+
+    for index in range(20):
+        cache.put(cache.key(str(index).encode(), "pdfminer"), "x" * 100)
+
+    # one scan to learn the starting size, none after that
+    assert len(scans) == 1
+    assert cache._total_bytes == 2000
+
+
+def test_overwriting_an_entry_does_not_grow_the_running_size(tmp_path):
+    cache = TextCache(tmp_path)
+    key = cache.key(b"resume", "pdfminer")
+
+    cache.put(key, "x" * 100)
+    cache.put(key, "x" * 100)
+    cache.put(key, "x" * 40)
+
+    assert cache._total_bytes == 40